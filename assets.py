@@ -0,0 +1,285 @@
+"""
+assets.py — Concurrent download stage for the static export's remote assets.
+
+Usage:
+    results = fetch_assets([
+        {"name": "Sortable.min.js", "url": "...", "dest": "output/static/Sortable.min.js"},
+        {"name": "Font Awesome", "url": "...zip", "dest": "output/static/fa", "extract_to": "output/static"},
+    ])
+    results["Sortable.min.js"]  -> True if the asset is present after the stage
+
+All downloads share one pooled requests.Session that retries transient failures
+with exponential backoff, so a cold build takes as long as the slowest asset.
+
+Downloads are streamed to disk in chunks, verified against the SHA-256 pinned in
+assets.lock.json and stored in
+a content-addressed cache shared by every checkout ($PORTFOLIO_ASSET_CACHE,
+default ~/.cache/portfolio-assets). A pinned asset that is already cached is
+never downloaded again; zips are extracted straight from the cached file.
+
+A URL with no pin is never trusted silently. By default the download is used
+for this build with a loud warning, and the lock file is left alone. The cache
+keeps its own URL -> digest index (urls.json, separate from the trust pins),
+so an unpinned asset that is already cached is reused, still with the warning,
+instead of downloaded again. With
+PIN_NEW_ASSETS (`python main.py --pin-assets`, or PORTFOLIO_PIN_ASSETS=1) its
+digest is written to assets.lock.json for review and commit. With REQUIRE_PINS
+(`--require-pins`, PORTFOLIO_REQUIRE_PINS=1, meant for CI) it fails.
+
+Zips are unpacked into a temp directory next to `extract_to` and renamed into
+place, with an EXTRACTED_MARKER file inside `dest`. An interrupted extraction
+never leaves a half-populated `dest` that later builds would trust.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from output_writer import copy_output
+
+
+MANIFEST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets.lock.json")
+CACHE_DIR = os.environ.get("PORTFOLIO_ASSET_CACHE",
+                           os.path.join(os.path.expanduser("~"), ".cache", "portfolio-assets"))
+URL_INDEX_PATH = os.path.join(CACHE_DIR, "urls.json")
+_CHUNK_SIZE = 1 << 16
+_MANIFEST_LOCK = threading.Lock()
+_URL_INDEX_LOCK = threading.Lock()
+# Explicit opt-ins for URLs missing from assets.lock.json (see module docstring)
+PIN_NEW_ASSETS = os.environ.get("PORTFOLIO_PIN_ASSETS") == "1"
+REQUIRE_PINS = os.environ.get("PORTFOLIO_REQUIRE_PINS") == "1"
+# Written into an extracted zip's `dest` as the last step; its absence means re-extract
+EXTRACTED_MARKER = ".extracted"
+
+
+class ChecksumMismatch(Exception):
+    """A downloaded asset did not match its pinned SHA-256."""
+
+
+class UnpinnedAsset(Exception):
+    """An asset has no pin in assets.lock.json and REQUIRE_PINS is set."""
+
+
+def _read_manifest():
+    try:
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _pin(url, digest):
+    """Record `digest` as the trusted SHA-256 for `url` in the manifest."""
+    with _MANIFEST_LOCK:
+        manifest = _read_manifest()
+        manifest[url] = digest
+        tmp_path = f"{MANIFEST_PATH}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+            f.write("\n")
+        os.replace(tmp_path, MANIFEST_PATH)
+    print(f"Pinned {url} -> sha256:{digest[:12]}... in {os.path.basename(MANIFEST_PATH)}")
+
+
+def _read_url_index():
+    try:
+        with open(URL_INDEX_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _index_url(url, digest):
+    """Remember that `url` last downloaded as `digest`. Not a pin: nothing is verified against it."""
+    with _URL_INDEX_LOCK:
+        index = _read_url_index()
+        if index.get(url) == digest:
+            return
+        index[url] = digest
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Re-read and merged above; per process and thread, since checkouts share the cache
+        tmp_path = f"{URL_INDEX_PATH}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+            f.write("\n")
+        os.replace(tmp_path, URL_INDEX_PATH)
+
+
+def _warn_unpinned(url, digest, source):
+    print(f"WARNING: {url} is not pinned in {os.path.basename(MANIFEST_PATH)}; using unverified "
+          f"{source} sha256:{digest}. Run `python main.py --pin-assets` and commit the lock file.")
+
+
+def configure_pinning(pin_new=None, require=None):
+    """Set PIN_NEW_ASSETS / REQUIRE_PINS for this process; None leaves a setting as it is."""
+    global PIN_NEW_ASSETS, REQUIRE_PINS
+    if pin_new is not None:
+        PIN_NEW_ASSETS = pin_new
+    if require is not None:
+        REQUIRE_PINS = require
+
+
+def cache_path(digest):
+    """Location of the artifact with SHA-256 `digest` in the content-addressed cache."""
+    return os.path.join(CACHE_DIR, "sha256", digest[:2], digest)
+
+
+def cached_path(url, expected_sha256=None, pin=True):
+    """The cached copy download() would reuse for `url`, or None if it has to fetch. Unpinned
+    URLs are looked up in the URL index, except while pinning (pins come from a fresh download)."""
+    if expected_sha256:
+        digest = expected_sha256
+    elif pin and not PIN_NEW_ASSETS:
+        digest = _read_url_index().get(url)
+    else:
+        return None
+    return cache_path(digest) if digest and os.path.exists(cache_path(digest)) else None
+
+
+def download(session, url, expected_sha256=None, timeout=30, pin=True):
+    """Return the cached path of `url`, streaming it into the cache only when it isn't there yet.
+    Raises ChecksumMismatch if the bytes don't hash to `expected_sha256`. An unpinned download
+    with pin=True is handled per PIN_NEW_ASSETS / REQUIRE_PINS; pin=False is for content that
+    may legitimately change and is neither verified nor recorded."""
+    if not expected_sha256 and pin and REQUIRE_PINS and not PIN_NEW_ASSETS:
+        raise UnpinnedAsset(f"{url} has no sha256 in {os.path.basename(MANIFEST_PATH)} "
+                            f"(run `python main.py --pin-assets` and commit the result)")
+    cached = cached_path(url, expected_sha256, pin)
+    if cached:
+        if not expected_sha256:
+            _warn_unpinned(url, os.path.basename(cached), "cached copy")
+        return cached
+
+    tmp_dir = os.path.join(CACHE_DIR, "tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+    tmp_path = os.path.join(tmp_dir, f"{os.getpid()}-{threading.get_ident()}.part")
+    sha = hashlib.sha256()
+    try:
+        with session.get(url, timeout=timeout, stream=True) as resp:
+            resp.raise_for_status()
+            with open(tmp_path, "wb") as f:
+                for chunk in resp.iter_content(_CHUNK_SIZE):
+                    sha.update(chunk)
+                    f.write(chunk)
+        digest = sha.hexdigest()
+        if expected_sha256 and digest != expected_sha256:
+            raise ChecksumMismatch(f"{url}: expected sha256 {expected_sha256}, got {digest}")
+        final_path = cache_path(digest)
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        os.replace(tmp_path, final_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    if pin:
+        _index_url(url, digest)
+    if not expected_sha256 and pin:
+        if PIN_NEW_ASSETS:
+            _pin(url, digest)
+        else:
+            _warn_unpinned(url, digest, "download")
+    return final_path
+
+
+def make_session(retries=3, backoff=0.5, pool_size=8):
+    """Return a requests.Session with a shared connection pool and retry/backoff on transient errors."""
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET", "HEAD"]),
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _extract_atomically(zip_path, extract_to, dest):
+    """Unpack `zip_path` into a temp dir beside `extract_to`, mark `dest` complete and rename each
+    top-level entry into `extract_to`, replacing (rather than merging into) what was there."""
+    os.makedirs(extract_to, exist_ok=True)
+    tmp_dir = os.path.join(extract_to, f".extract-{os.getpid()}-{threading.get_ident()}")
+    try:
+        with zipfile.ZipFile(zip_path) as z:
+            z.extractall(tmp_dir)
+        staged_dest = os.path.join(tmp_dir, os.path.relpath(dest, extract_to))
+        if not os.path.isdir(staged_dest):
+            raise zipfile.BadZipFile(f"archive does not contain {os.path.basename(dest)}/")
+        open(os.path.join(staged_dest, EXTRACTED_MARKER), "w").close()
+        for name in os.listdir(tmp_dir):
+            target = os.path.join(extract_to, name)
+            if os.path.isdir(target) and not os.path.islink(target):
+                # A directory can't be renamed over a non-empty one: move the old copy aside first
+                old = os.path.join(tmp_dir, f".old-{name}")
+                os.replace(target, old)
+            os.replace(os.path.join(tmp_dir, name), target)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _is_present(asset):
+    if asset.get("extract_to"):
+        return os.path.exists(os.path.join(asset["dest"], EXTRACTED_MARKER))
+    return os.path.exists(asset["dest"])
+
+
+def _fetch_one(session, asset, manifest):
+    """Fetch a single asset spec via the cache. Zips are extracted to `extract_to`, other files
+    copied to `dest`. Returns (size in bytes, whether it was served from the cache)."""
+    pin = asset.get("pin", True)
+    expected = asset.get("sha256") or (manifest.get(asset["url"]) if pin else None)
+    cached = cached_path(asset["url"], expected, pin) is not None
+    path = download(session, asset["url"], expected, timeout=asset.get("timeout", 30), pin=pin)
+    if asset.get("extract_to"):
+        _extract_atomically(path, asset["extract_to"], asset["dest"])
+    else:
+        copy_output(path, asset["dest"], mode=0o755 if asset.get("executable") else None)
+    return os.path.getsize(path), cached
+
+
+def fetch_assets(assets, session=None, max_workers=None):
+    """Download every asset whose `dest` is missing, all at once. Returns {name: present}.
+
+    Each asset is a dict with name, url and dest, plus optional timeout, sha256
+    (overrides the manifest pin), pin (False: neither verify nor pin the download),
+    extract_to (treat the download as a zip and unpack it there) and executable. Failures are reported per asset and never abort the
+    other downloads."""
+    results = {a["name"]: True for a in assets if _is_present(a)}
+    pending = [a for a in assets if a["name"] not in results]
+    if not pending:
+        return results
+
+    manifest = _read_manifest()
+    own_session = session is None
+    session = session or make_session(pool_size=max(len(pending), 1))
+
+    def run(asset):
+        start = time.perf_counter()
+        try:
+            size, cached = _fetch_one(session, asset, manifest)
+            source = "from cache" if cached else "downloaded"
+            print(f"{asset['name']} ({size // 1024} KB) {source} in {time.perf_counter() - start:.2f}s.")
+            return asset["name"], True
+        except (requests.exceptions.RequestException, ChecksumMismatch, UnpinnedAsset, zipfile.BadZipFile, OSError) as e:
+            print(f"Error downloading {asset['name']} after {time.perf_counter() - start:.2f}s: {e}")
+            return asset["name"], False
+
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers or len(pending)) as pool:
+            results.update(pool.map(run, pending))
+    finally:
+        if own_session:
+            session.close()
+    print(f"Asset fetch stage finished in {time.perf_counter() - start:.2f}s ({len(pending)} assets).")
+    return results
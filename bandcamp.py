@@ -0,0 +1,219 @@
+"""
+bandcamp.py — Latest-release lookup for a Bandcamp artist, with a persistent
+stale-while-revalidate cache.
+
+Usage:
+    cache = BandcampCache()
+    cache.get(artist_url)   -> cached release dict or None, never blocks on the network
+    cache.version           -> bumps whenever a stored release changes
+
+Releases are persisted to a JSON file and refreshed by a background thread once
+their TTL expires. Failed lookups are negative-cached with exponential backoff;
+the last good release keeps being served meanwhile.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+
+import requests
+
+
+_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+
+
+def fetch_latest_bandcamp_album(artist_url, timeout=10):
+    """Fetch the latest album from a Bandcamp artist's discography page.
+    Returns a dict with artwork_url (embed), music_url, and music_title,
+    or None if fetching fails."""
+    try:
+        # Get discography page — albums appear newest first
+        resp = requests.get(artist_url.rstrip('/') + '/music', headers=_HEADERS, timeout=timeout)
+        resp.raise_for_status()
+
+        album_match = re.search(r'<a href="(/album/[^"]+)">', resp.text)
+        if not album_match:
+            return None
+
+        album_path = album_match.group(1)
+        album_url = artist_url.rstrip('/') + album_path
+
+        # Get album page for embed ID and title
+        resp = requests.get(album_url, headers=_HEADERS, timeout=timeout)
+        resp.raise_for_status()
+
+        id_match = re.search(
+            r'<meta\s+name="bc-page-properties"\s+content="\{&quot;item_type&quot;:&quot;a&quot;,&quot;item_id&quot;:(\d+)',
+            resp.text
+        )
+        if not id_match:
+            return None
+        album_id = id_match.group(1)
+
+        title_match = re.search(r'<title>([^|]+)\|', resp.text)
+        title = title_match.group(1).strip() if title_match else album_path.replace('/album/', '').replace('-', ' ').title()
+
+        embed_url = (
+            f"https://bandcamp.com/EmbeddedPlayer/album={album_id}"
+            f"/size=large/bgcol=181a1b/linkcol=056cc4/tracklist=false/artwork=small/transparent=true/"
+        )
+
+        return {
+            "artwork_url": embed_url,
+            "music_url": album_url,
+            "music_title": title,
+        }
+    except Exception as e:
+        print(f"Warning: could not fetch latest Bandcamp album — {e}")
+        return None
+
+
+class BandcampCache:
+    """Persistent, background-refreshed cache of latest Bandcamp releases, keyed by artist URL."""
+
+    def __init__(self, path=os.path.join(".cache", "bandcamp.json"), ttl=3600,
+                 failure_backoff=60, max_backoff=3600, fetch=fetch_latest_bandcamp_album):
+        self.path = path
+        self.ttl = ttl
+        self.failure_backoff = failure_backoff
+        self.max_backoff = max_backoff
+        self.fetch = fetch
+        self.version = 0
+        self._entries = None
+        self._tracked = set()
+        # artist URL -> Event set when the running fetch for it finishes
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._worker = None
+
+    # --- Persistence -----------------------------------------------------
+
+    def _read(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _load(self):
+        """Read the cache file once; a missing or corrupt file starts empty."""
+        if self._entries is None:
+            self._entries = self._read()
+        return self._entries
+
+    def _save(self, artist_url):
+        """Persist the entry for `artist_url` atomically so a crash never leaves a truncated file.
+        Other processes (the reloader's parent and child, music.py) share the file, so the other
+        entries are taken from disk, not overwritten with this process's copies."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        entries = self._read()
+        entries[artist_url] = self._entries[artist_url]
+        for url, entry in entries.items():
+            if self._entries.get(url, {}).get("release") != entry.get("release"):
+                self.version += 1
+        self._entries = entries
+        # Per process and thread, like output_writer, so concurrent writers never share a temp file
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Warning: could not persist Bandcamp cache — {e}")
+
+    # --- Public API ------------------------------------------------------
+
+    def get(self, artist_url):
+        """Return the cached release for `artist_url` (possibly stale) or None.
+        Never touches the network; registers the URL for background refresh."""
+        with self._lock:
+            entry = self._load().get(artist_url)
+            if artist_url not in self._tracked:
+                self._tracked.add(artist_url)
+                self._ensure_worker()
+                self._wake.set()
+        return entry.get("release") if entry else None
+
+    def is_due(self, artist_url, now=None):
+        """True when `artist_url` has no entry, its TTL expired, or its failure backoff elapsed."""
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._load().get(artist_url)
+        return entry is None or now >= entry.get("next_refresh", 0)
+
+    def refresh(self, artist_url, only_if_due=False):
+        """Fetch `artist_url` synchronously and store the outcome. Returns the served release.
+        If a fetch for the URL is already running, waits for it instead of starting another.
+        With only_if_due=True, nothing is fetched unless the entry is due."""
+        with self._lock:
+            done = self._inflight.get(artist_url)
+            owner = done is None
+            if owner:
+                entry = self._load().get(artist_url)
+                if only_if_due and entry is not None and time.time() < entry.get("next_refresh", 0):
+                    return entry.get("release")
+                done = self._inflight[artist_url] = threading.Event()
+        if not owner:
+            done.wait()
+            with self._lock:
+                entry = self._load().get(artist_url)
+            return entry.get("release") if entry else None
+
+        try:
+            release = self.fetch(artist_url)
+            now = time.time()
+            with self._lock:
+                entries = self._load()
+                entry = entries.get(artist_url, {})
+                if release:
+                    changed = release != entry.get("release")
+                    entry.update(release=release, fetched_at=now, failures=0, next_refresh=now + self.ttl)
+                else:
+                    # Negative-cache the failure, keep serving the last good release
+                    changed = False
+                    failures = entry.get("failures", 0) + 1
+                    backoff = min(self.failure_backoff * 2 ** (failures - 1), self.max_backoff)
+                    entry.update(failures=failures, next_refresh=now + backoff)
+                entries[artist_url] = entry
+                if changed:
+                    self.version += 1
+                self._save(artist_url)
+                return entry.get("release")
+        finally:
+            with self._lock:
+                del self._inflight[artist_url]
+            done.set()
+
+    def ensure_fresh(self, artist_url):
+        """Blocking refresh for build steps: fetch only if the entry is due, joining a
+        background refresh of the same URL that is already running."""
+        return self.refresh(artist_url, only_if_due=True)
+
+    # --- Background worker -----------------------------------------------
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="bandcamp-refresh", daemon=True)
+            self._worker.start()
+
+    def _run(self):
+        while True:
+            self._wake.clear()
+            now = time.time()
+            with self._lock:
+                tracked = list(self._tracked)
+                entries = self._load()
+                schedule = {url: entries.get(url, {}).get("next_refresh", 0) for url in tracked}
+            for url, due in schedule.items():
+                if due <= now:
+                    self.refresh(url, only_if_due=True)
+            with self._lock:
+                entries = self._load()
+                upcoming = [entries.get(url, {}).get("next_refresh", 0) for url in self._tracked]
+            timeout = max(1.0, min(upcoming) - time.time()) if upcoming else None
+            self._wake.wait(timeout)
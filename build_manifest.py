@@ -0,0 +1,77 @@
+"""
+build_manifest.py — Input-hash bookkeeping for incremental static builds.
+
+Usage:
+    manifest = BuildManifest("output/.build_manifest.json")
+    key = input_key(file_digest("templates/index.html"), value_digest(data))
+    if not manifest.is_fresh("output/index.html", key):
+        ...rebuild...
+        manifest.record("output/index.html", key)
+    manifest.save()
+
+Each output is recorded with one key hashed from everything it was built from
+(data fields, templates, Markdown, assets). An output is rebuilt only when its
+key changes or the file has gone missing.
+"""
+
+import hashlib
+import json
+import os
+
+
+def value_digest(value):
+    """SHA-256 of a JSON-serialisable value (dict keys sorted, unknown types stringified)."""
+    payload = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def file_digest(path):
+    """SHA-256 of a file's bytes, or of the empty marker if it doesn't exist."""
+    sha = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                sha.update(chunk)
+    except OSError:
+        return "missing"
+    return sha.hexdigest()
+
+
+def input_key(*digests):
+    """Combine several input digests into one output key."""
+    return hashlib.sha256("\n".join(digests).encode("utf-8")).hexdigest()
+
+
+class BuildManifest:
+    """Maps each output path to the key of the inputs it was last built from."""
+
+    def __init__(self, path, enabled=True):
+        self.path = path
+        self.enabled = enabled
+        self.rebuilt = []
+        self.skipped = []
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def is_fresh(self, output, key, always_check=False):
+        """True if `output` exists and was built from `key`. Always False when disabled (full
+        build), unless `always_check` — for outputs that are content-keyed even in full builds."""
+        fresh = (self.enabled or always_check) and self._entries.get(output) == key and os.path.exists(output)
+        (self.skipped if fresh else self.rebuilt).append(output)
+        return fresh
+
+    def record(self, output, key):
+        self._entries[output] = key
+
+    def forget(self, output):
+        self._entries.pop(output, None)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,101 @@
+"""
+build_pool.py — Run independent static-build jobs on a process pool.
+
+Usage:
+    with BuildPool() as pool:
+        pool.submit("og.png", render_og, data, path)
+        pool.submit("resume.pdf", render_pdf, data, path)
+        results = pool.wait_all()      -> {name: JobResult}
+
+Each job is timed inside its worker and failures are isolated: an exception (or a
+crashed worker) marks that one job as failed without affecting the others. With
+max_workers=1, or where process pools are unavailable, jobs run inline.
+
+Workers are spawned, not forked: the build runs alongside threads (the asset
+fetcher, the Bandcamp refresher, the dev server), and forking a process that
+holds another thread's lock can deadlock the child. Spawned workers import the
+job's module afresh, so jobs must not depend on state the parent set at runtime,
+and a script that builds must keep its work under `if __name__ == "__main__":`.
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+
+class JobResult:
+    """Outcome of one build job."""
+
+    def __init__(self, name, ok, value=None, error=None, seconds=0.0):
+        self.name = name
+        self.ok = ok
+        self.value = value
+        self.error = error
+        self.seconds = seconds
+
+
+def _timed_call(fn, args):
+    """Worker-side wrapper: run fn(*args), returning (ok, value, error, seconds)."""
+    start = time.perf_counter()
+    try:
+        return True, fn(*args), None, time.perf_counter() - start
+    except Exception as e:
+        return False, None, f"{type(e).__name__}: {e}", time.perf_counter() - start
+
+
+class BuildPool:
+    """Submit named, picklable jobs; collect JobResults with per-job timing."""
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor = None
+        self._futures = {}
+        self.submitted = []
+        self.results = {}
+
+    def __enter__(self):
+        if self.max_workers > 1:
+            try:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                     mp_context=multiprocessing.get_context("spawn"))
+            except (OSError, NotImplementedError, ImportError) as e:
+                print(f"Process pool unavailable, building serially: {e}")
+        return self
+
+    def __exit__(self, *exc):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        return False
+
+    def submit(self, name, fn, *args):
+        """Queue fn(*args) under `name`. fn must be a module-level function."""
+        self.submitted.append(name)
+        if self._executor is None:
+            self._store(name, _timed_call(fn, args))
+        else:
+            self._futures[name] = self._executor.submit(_timed_call, fn, args)
+
+    def result(self, name):
+        """Block until the job `name` finishes and return its JobResult."""
+        if name not in self.results:
+            future = self._futures.pop(name)
+            try:
+                outcome = future.result()
+            except Exception as e:  # worker crashed or result wasn't picklable
+                outcome = (False, None, f"{type(e).__name__}: {e}", 0.0)
+            self._store(name, outcome)
+        return self.results[name]
+
+    def wait_all(self):
+        for name in list(self._futures):
+            self.result(name)
+        return self.results
+
+    def _store(self, name, outcome):
+        ok, value, error, seconds = outcome
+        self.results[name] = JobResult(name, ok, value, error, seconds)
+        if ok:
+            print(f"  [{seconds:6.2f}s] {name}")
+        else:
+            print(f"  [{seconds:6.2f}s] {name} FAILED — {error}")
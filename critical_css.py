@@ -0,0 +1,171 @@
+"""
+critical_css.py — Inline above-the-fold CSS and defer the remaining stylesheets.
+
+Usage:
+    html = inline_critical_css(html, css_text)
+
+The fold is the start of <body> up to the first closing </section> or </header>
+(nav + hero on the home page, nav + title block on case studies); pages without
+either are treated as all-above-the-fold. Rules from `css_text` whose class and
+id selectors only reference markup in that region are inlined in a <style> block,
+and every <link rel="stylesheet"> in the page is switched to a non-blocking
+preload that applies itself on load (with a <noscript> fallback).
+"""
+
+import re
+
+
+_FOLD_MARKERS = ("</section>", "</header>")
+
+# Classes toggled by script before first paint must survive pruning
+_ALWAYS_PRESENT_CLASSES = {"dark"}
+
+_CLASS_ATTR_RE = re.compile(r'\bclass\s*=\s*"([^"]*)"')
+_ID_ATTR_RE = re.compile(r'\bid\s*=\s*"([^"]*)"')
+_SELECTOR_CLASS_RE = re.compile(r"\.((?:\\[0-9a-fA-F]{1,6}\s?|\\.|[\w-])+)")
+_SELECTOR_ID_RE = re.compile(r"#((?:\\.|[\w-])+)")
+_ESCAPE_RE = re.compile(r"\\([0-9a-fA-F]{1,6}\s?|.)")
+_STYLESHEET_LINK_RE = re.compile(r"""<link\b[^>]*\brel=["']stylesheet["'][^>]*>""", re.IGNORECASE)
+_HREF_RE = re.compile(r"""\bhref=["']([^"']+)["']""")
+_ANIMATION_RE = re.compile(r"animation(?:-name)?\s*:\s*([^;}]+)")
+_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+_BANNER_RE = re.compile(r"\s*/\*!.*?\*/", re.DOTALL)
+
+
+def _unescape(ident):
+    def repl(m):
+        seq = m.group(1)
+        if re.fullmatch(r"[0-9a-fA-F]{1,6}\s?", seq):
+            return chr(int(seq.strip(), 16))
+        return seq
+    return _ESCAPE_RE.sub(repl, ident)
+
+
+def fold_markup(html):
+    """Return the <html>/<body> tags plus the body markup above the fold."""
+    body_start = html.find("<body")
+    if body_start < 0:
+        return html
+    html_tag = html[html.find("<html"):html.find(">", html.find("<html")) + 1] if "<html" in html else ""
+    ends = [i for i in (html.find(m, body_start) for m in _FOLD_MARKERS) if i >= 0]
+    end = min(ends) if ends else len(html)
+    return html_tag + html[body_start:end]
+
+
+def used_selectors(markup):
+    """Return (classes, ids) referenced by the markup."""
+    classes = set(_ALWAYS_PRESENT_CLASSES)
+    for value in _CLASS_ATTR_RE.findall(markup):
+        classes.update(value.split())
+    ids = set(_ID_ATTR_RE.findall(markup))
+    return classes, ids
+
+
+def _parse_blocks(css):
+    """Split CSS into top-level (prelude, body) pairs; body is None for statements like @charset."""
+    blocks = []
+    i, n = 0, len(css)
+    while i < n:
+        brace = css.find("{", i)
+        semi = css.find(";", i)
+        if brace < 0:
+            break
+        if 0 <= semi < brace and css[i:semi].strip().startswith("@"):
+            blocks.append((css[i:semi].strip(), None))
+            i = semi + 1
+            continue
+        depth, j = 1, brace + 1
+        while j < n and depth:
+            if css[j] == "{":
+                depth += 1
+            elif css[j] == "}":
+                depth -= 1
+            elif css[j] in "\"'":
+                j = css.find(css[j], j + 1)
+                if j < 0:
+                    j = n
+            j += 1
+        blocks.append((css[i:brace].strip(), css[brace + 1:j - 1]))
+        i = j
+    return blocks
+
+
+def _selector_matches(selector, classes, ids):
+    required_classes = {_unescape(c) for c in _SELECTOR_CLASS_RE.findall(selector)}
+    required_ids = {_unescape(i) for i in _SELECTOR_ID_RE.findall(selector)}
+    return required_classes <= classes and required_ids <= ids
+
+
+def _prune(css, classes, ids, keyframes_used, keep_font_faces):
+    out = []
+    for prelude, body in _parse_blocks(css):
+        if body is None:
+            if not prelude.startswith(("@import", "@charset")):
+                out.append(prelude + ";")
+        elif prelude.startswith(("@media", "@supports", "@layer")):
+            inner = [i if isinstance(i, str) else f"{i[0]}{{{i[1]}}}"
+                     for i in _prune(body, classes, ids, keyframes_used, keep_font_faces)]
+            if inner:
+                out.append(f"{prelude}{{{''.join(inner)}}}")
+        elif prelude.startswith("@keyframes"):
+            out.append((prelude, body))  # resolved once all animations are known
+        elif prelude.startswith("@font-face") and keep_font_faces:
+            out.append(f"{prelude}{{{body}}}")
+        elif prelude.startswith("@"):
+            continue  # @font-face and friends load with the full stylesheets
+        else:
+            selectors = [s for s in prelude.split(",") if _selector_matches(s, classes, ids)]
+            if selectors:
+                for value in _ANIMATION_RE.findall(body):
+                    keyframes_used.update(value.replace(",", " ").split())
+                out.append(f"{','.join(s.strip() for s in selectors)}{{{body}}}")
+    return out
+
+
+def prune_css(css, classes, ids=frozenset(), keep_font_faces=False):
+    """Return the rules of `css` whose class/id selectors are all within `classes`/`ids`.
+    Selector-less rules (:root, element selectors) are kept, keyframes only if a kept rule
+    animates with them. Comments are dropped, except a leading /*! license banner */."""
+    banner = _BANNER_RE.match(css)
+    css = _COMMENT_RE.sub("", css)
+    keyframes_used = set()
+    parts = [banner.group(0)] if banner else []
+    for item in _prune(css, classes, ids, keyframes_used, keep_font_faces):
+        if isinstance(item, tuple):
+            prelude, body = item
+            if prelude.split()[-1] in keyframes_used:
+                parts.append(f"{prelude}{{{body}}}")
+        else:
+            parts.append(item)
+    return "".join(parts)
+
+
+def critical_css(css, markup):
+    """Return the subset of `css` needed to render `markup`."""
+    classes, ids = used_selectors(markup)
+    # Only the full stylesheet needs the license banner
+    return _BANNER_RE.sub("", prune_css(css, classes, ids), count=1)
+
+
+def _defer(link_tag):
+    href = _HREF_RE.search(link_tag)
+    if not href:
+        return link_tag
+    url = href.group(1)
+    return (f'<link rel="preload" href="{url}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">'
+            f'<noscript>{link_tag}</noscript>')
+
+
+def inline_critical_css(html, css):
+    """Inline the above-the-fold subset of `css` and make every stylesheet link non-blocking."""
+    head_end = html.find("</head>")
+    if head_end < 0:
+        return html
+    head, rest = html[:head_end], html[head_end:]
+    first_link = _STYLESHEET_LINK_RE.search(head)
+    if not first_link:
+        return html
+    inlined = critical_css(css, fold_markup(html))
+    head = (head[:first_link.start()] + f"<style data-critical>{inlined}</style>\n    "
+            + _STYLESHEET_LINK_RE.sub(lambda m: _defer(m.group(0)), head[first_link.start():]))
+    return head + rest
@@ -0,0 +1,129 @@
+"""
+fingerprint.py — Content-hashed copies of the export's static assets.
+
+Usage:
+    manifest = fingerprint_assets("output", ["static/tailwind.css", "og.png"])
+    manifest["static/tailwind.css"]  -> "static/tailwind.3f2a9c1e.css"
+    write_manifest("output", manifest)   -> output/asset-manifest.json
+
+Each asset is copied to name.<hash>.ext next to the original (the unhashed file
+stays for the dev server and for build stages that check it). Stylesheets are
+fingerprinted after the files their url(...) references point at, with those
+references rewritten, so a changed font also changes the hash of its CSS. Hashed
+paths never change content, so they can be served with a one-year immutable
+Cache-Control.
+
+Older hashed copies are only removed by prune_fingerprints(), which the export
+calls once the new pages and manifest are on disk. It keeps the previous
+generation too, so pages cached under the old names keep working for one more
+build.
+"""
+
+import hashlib
+import json
+import os
+import re
+
+from output_writer import write_output
+
+
+MANIFEST_NAME = "asset-manifest.json"
+_HASH_LEN = 8
+_CSS_URL_RE = re.compile(r"""url\((["']?)([^)"'#?]+)([^)"']*)\1\)""")
+
+
+def _hashed_name(rel_path, data):
+    root, ext = os.path.splitext(rel_path)
+    return f"{root}.{hashlib.sha256(data).hexdigest()[:_HASH_LEN]}{ext}"
+
+
+def _remove_stale(root, rel_path, keep):
+    """Delete hashed copies of `rel_path` (and their .gz/.br siblings) not named in `keep`."""
+    directory, name = os.path.split(os.path.join(root, rel_path))
+    stem, ext = os.path.splitext(name)
+    pattern = re.compile(re.escape(stem) + r"\.[0-9a-f]{%d}" % _HASH_LEN + re.escape(ext) + r"(\.gz|\.br)?$")
+    keep = {os.path.basename(k) for k in keep}
+    removed = 0
+    for other in os.listdir(directory):
+        m = pattern.fullmatch(other)
+        if m and other[:len(other) - len(m.group(1) or "")] not in keep:
+            os.remove(os.path.join(directory, other))
+            removed += 1
+    return removed
+
+
+def fingerprint_assets(root, rel_paths):
+    """Write a hashed copy of every existing file in `rel_paths` (relative to `root`, '/'-separated)
+    and of every file their stylesheets reference. Returns {rel_path: hashed_rel_path}."""
+    manifest = {}
+
+    def visit(rel_path):
+        if rel_path in manifest:
+            return manifest[rel_path]
+        path = os.path.join(root, rel_path)
+        with open(path, "rb") as f:
+            data = f.read()
+        if rel_path.endswith(".css"):
+            base = os.path.dirname(rel_path)
+
+            def rewrite(m):
+                quote, url, suffix = m.groups()
+                if url.startswith(("data:", "http:", "https:", "/")):
+                    return m.group(0)
+                target = os.path.normpath(os.path.join(base, url)).replace(os.sep, "/")
+                if not os.path.isfile(os.path.join(root, target)):
+                    return m.group(0)
+                hashed = os.path.relpath(visit(target), base or ".").replace(os.sep, "/")
+                return f"url({quote}{hashed}{suffix}{quote})"
+
+            data = _CSS_URL_RE.sub(rewrite, data.decode("utf-8")).encode("utf-8")
+        hashed = _hashed_name(rel_path, data)
+        write_output(os.path.join(root, hashed), data)
+        manifest[rel_path] = hashed
+        return hashed
+
+    for rel_path in rel_paths:
+        if os.path.isfile(os.path.join(root, rel_path)):
+            visit(rel_path)
+    return manifest
+
+
+def prune_fingerprints(root, manifest, previous=None, hashed_dirs=()):
+    """Delete hashed copies that are neither in `manifest` nor in the `previous` one (the
+    manifest the last build wrote). `hashed_dirs` (relative to `root`) hold nothing but
+    content-named files listed as identity entries, like the image variants: any file
+    there that neither manifest names is deleted. Call after the pages referencing
+    `manifest` are written. Returns the number of files removed."""
+    previous = previous or {}
+    removed = 0
+    for rel_path, hashed in manifest.items():
+        if hashed == rel_path or not os.path.isfile(os.path.join(root, rel_path)):
+            continue
+        keep = {hashed} | ({previous[rel_path]} if rel_path in previous else set())
+        removed += _remove_stale(root, rel_path, keep)
+    referenced = set(manifest.values()) | set(previous.values())
+    for rel_dir in hashed_dirs:
+        directory = os.path.join(root, rel_dir)
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            continue
+        for name in names:
+            base = name[:-3] if name.endswith((".gz", ".br")) else name
+            if f"{rel_dir}/{base}" not in referenced and os.path.isfile(os.path.join(directory, name)):
+                os.remove(os.path.join(directory, name))
+                removed += 1
+    return removed
+
+
+def write_manifest(root, manifest):
+    """Write {original: hashed} to <root>/asset-manifest.json."""
+    write_output(os.path.join(root, MANIFEST_NAME), json.dumps(manifest, indent=2, sort_keys=True))
+
+
+def read_manifest(root):
+    try:
+        with open(os.path.join(root, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
@@ -0,0 +1,45 @@
+"""
+font_subset.py — Shrink font files to the glyphs a page actually uses.
+
+Usage:
+    subset_font("in.woff2", "out.woff2", unicodes={0xf3e2, 0xf109})
+    subset_font("Inter.ttf", "Inter.woff2", text="Hello world")
+
+Needs fontTools (installed alongside fpdf2) and, for WOFF2 output, brotli.
+SUBSETTING_AVAILABLE is False when either is missing; callers should then ship
+the original font files.
+"""
+
+import io
+
+from output_writer import write_output
+
+try:
+    from fontTools import subset as _ft_subset
+    import brotli  # noqa: F401 — fontTools needs it to read and write WOFF2
+    SUBSETTING_AVAILABLE = True
+except ImportError:
+    _ft_subset = None
+    SUBSETTING_AVAILABLE = False
+
+
+def subset_font(src_path, dst_path, unicodes=(), text=""):
+    """Write a WOFF2 copy of `src_path` containing only the given code points / characters.
+    Returns the size of the written file in bytes."""
+    if not SUBSETTING_AVAILABLE:
+        raise RuntimeError("font subsetting needs the fontTools and brotli packages")
+    options = _ft_subset.Options()
+    options.flavor = "woff2"
+    options.layout_features = ["*"]
+    options.name_IDs = ["*"]
+    options.notdef_outline = True
+    options.ignore_missing_unicodes = True
+    font = _ft_subset.load_font(src_path, options)
+    subsetter = _ft_subset.Subsetter(options)
+    subsetter.populate(unicodes=set(unicodes) | {ord(c) for c in text})
+    subsetter.subset(font)
+    buf = io.BytesIO()
+    _ft_subset.save_font(font, buf, options)
+    font.close()
+    write_output(dst_path, buf.getvalue())
+    return len(buf.getvalue())
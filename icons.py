@@ -0,0 +1,94 @@
+"""
+icons.py — Trim Font Awesome down to the icons the rendered site uses.
+
+Usage:
+    classes = used_icon_classes(index_html, page_404_html)
+    css_rel_path = build_icon_subset(fa_dir, out_dir, classes)
+
+Produces out_dir/css/icons.min.css holding only the base rules plus the rules for
+`classes`, and out_dir/webfonts/ with each Font Awesome font cut down to the
+code points those rules use (WOFF2 only). Without fontTools/brotli the CSS is
+still trimmed and the original font files are copied instead.
+"""
+
+import os
+import re
+
+from critical_css import prune_css
+from font_subset import SUBSETTING_AVAILABLE, subset_font
+from output_writer import copy_output, prune_outputs, write_output
+
+
+# fa, fas/far/fab, fa-solid, fa-laptop-code, fa-2x ... anywhere in the page, including scripts
+_ICON_CLASS_RE = re.compile(r"(?<![\w-])fa[a-z]?(?:-[a-z0-9]+)*(?![\w-])")
+_CONTENT_RE = re.compile(r"""content\s*:\s*["']([^"']*)["']""")
+_ESCAPE_RE = re.compile(r"\\([0-9a-fA-F]{1,6})\s?")
+_FONT_FACE_RE = re.compile(r"@font-face\s*\{[^}]*\}")
+_WOFF2_URL_RE = re.compile(r"""url\(["']?([^)"']+\.woff2)["']?\)""")
+_SRC_RE = re.compile(r"src\s*:[^;}]*")
+
+
+def used_icon_classes(*documents):
+    """Return every Font Awesome class token that appears in the given rendered pages."""
+    classes = set()
+    for doc in documents:
+        classes.update(_ICON_CLASS_RE.findall(doc))
+    return classes
+
+
+def _code_points(css):
+    """Code points referenced by `content:` declarations in `css`."""
+    points = set()
+    for value in _CONTENT_RE.findall(css):
+        rest = _ESCAPE_RE.sub(lambda m: chr(int(m.group(1), 16)), value)
+        points.update(ord(c) for c in rest)
+    return points
+
+
+def build_icon_subset(fa_dir, out_dir, classes):
+    """Write the trimmed CSS and fonts for `classes` under `out_dir`.
+    Returns the CSS path relative to `out_dir`'s parent (for use after static_root)."""
+    with open(os.path.join(fa_dir, "css", "all.min.css"), "r", encoding="utf-8") as f:
+        full_css = f.read()
+    css = prune_css(full_css, classes, keep_font_faces=True)
+    code_points = _code_points(css)
+
+    fonts_out = os.path.join(out_dir, "webfonts")
+    css_out = os.path.join(out_dir, "css")
+    os.makedirs(fonts_out, exist_ok=True)
+    os.makedirs(css_out, exist_ok=True)
+
+    subset_done = {}
+    shipped = set()
+
+    def rewrite_face(match):
+        face = match.group(0)
+        woff2 = _WOFF2_URL_RE.search(face)
+        if not woff2:
+            return face
+        rel_url = woff2.group(1)
+        name = os.path.basename(rel_url)
+        if not SUBSETTING_AVAILABLE:
+            # Ship the original files that the face references
+            for url in re.findall(r"""url\(["']?([^)"']+)["']?\)""", face):
+                src = os.path.join(fa_dir, "css", url)
+                if os.path.exists(src):
+                    copy_output(src, os.path.join(fonts_out, os.path.basename(url)))
+                    shipped.add(os.path.basename(url))
+            return face
+        if name not in subset_done:
+            subset_done[name] = subset_font(os.path.join(fa_dir, "css", rel_url),
+                                            os.path.join(fonts_out, name), unicodes=code_points)
+            shipped.add(name)
+        return _SRC_RE.sub(f'src:url(../webfonts/{name}) format("woff2")', face, count=1)
+
+    css = _FONT_FACE_RE.sub(rewrite_face, css)
+    write_output(os.path.join(css_out, "icons.min.css"), css)
+    # Fonts for icons that are no longer used go only after the new set is in place
+    prune_outputs(fonts_out, shipped)
+
+    total_fonts = sum(os.path.getsize(os.path.join(fonts_out, n)) for n in shipped)
+    print(f"Font Awesome subset: {len([c for c in classes if c.startswith('fa-')])} icon classes, "
+          f"{len(code_points)} glyphs, CSS {len(css) // 1024} KB, fonts {total_fonts // 1024} KB"
+          f"{'' if SUBSETTING_AVAILABLE else ' (unsubsetted: install fontTools and brotli)'}.")
+    return f"{os.path.basename(out_dir)}/css/icons.min.css"
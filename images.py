@@ -0,0 +1,187 @@
+"""
+images.py — Responsive image variants for the static export.
+
+Usage:
+    pipeline = ImagePipeline("output/static/img", ".cache/images")
+    images = pipeline.process(image_refs(data), base_dirs=["output", "."])
+    images["static/me.jpg"] -> {
+        "src": "img/me-640.1a2b3c4d.jpg", "width": 640, "height": 640,
+        "sources": [{"type": "image/avif", "variants": [{"path": "img/me-320.9f8e7d6c.avif", "width": 320}, ...]},
+                    {"type": "image/webp", "variants": [...]}],
+    }
+
+Each raster image referenced by the site data (remote URLs are downloaded once
+into the cache dir, local paths are resolved against `base_dirs`) is resized to
+the breakpoints below its own width and encoded as AVIF (when Pillow supports it)
+and WebP, plus a fallback in its original format. File names carry a hash of
+their bytes so they can be cached forever. Encodes are keyed on the source bytes
+in `<cache_dir>/variants.json`, so unchanged images are never re-encoded. SVGs,
+animated images and anything Pillow can't open are left out (templates keep the
+plain <img> for them).
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from assets import fetch_assets
+from build_manifest import file_digest, input_key, value_digest
+from output_writer import write_output
+
+
+BREAKPOINTS = (320, 640, 960, 1280)
+
+# (Pillow format, MIME type, save options), best first
+_FORMATS = [
+    ("AVIF", "image/avif", {"quality": 55, "speed": 6}),
+    ("WEBP", "image/webp", {"quality": 78, "method": 6}),
+]
+_EXTENSIONS = {"AVIF": "avif", "WEBP": "webp", "JPEG": "jpg", "PNG": "png"}
+
+# Data fields that hold image URLs
+_IMAGE_KEYS = ("hero_image_url", "image_url", "issuer_logo_url", "video_poster")
+
+
+def available_formats():
+    """The modern formats this Pillow build can encode."""
+    from PIL import features
+    return [f for f in _FORMATS if features.check(f[0].lower())]
+
+
+def image_refs(value):
+    """Every image URL/path found under the image fields of the site data."""
+    refs = set()
+    if isinstance(value, dict):
+        for k, v in value.items():
+            if k in _IMAGE_KEYS and isinstance(v, str) and v and not v.startswith("data:"):
+                refs.add(v)
+            else:
+                refs.update(image_refs(v))
+    elif isinstance(value, list):
+        for v in value:
+            refs.update(image_refs(v))
+    return refs
+
+
+def _is_remote(ref):
+    return ref.startswith(("http://", "https://", "//"))
+
+
+def _stem(ref):
+    name = os.path.splitext(os.path.basename(ref.split("?")[0].rstrip("/")))[0]
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "image"
+
+
+class ImagePipeline:
+    """Encodes responsive variants into `out_dir`, remembering past encodes in `cache_dir`."""
+
+    def __init__(self, out_dir, cache_dir, breakpoints=BREAKPOINTS):
+        self.out_dir = out_dir
+        self.cache_dir = cache_dir
+        self.breakpoints = tuple(breakpoints)
+        self.formats = available_formats()
+        self._index_path = os.path.join(cache_dir, "variants.json")
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                self._index = json.load(f)
+        except (OSError, ValueError):
+            self._index = {}
+        self._settings = value_digest([self.breakpoints, self.formats, file_digest(__file__)])
+
+    def _sources(self, refs, base_dirs, download):
+        """Map each ref to a local file: remote refs via the download cache, local ones via `base_dirs`."""
+        sources = {}
+        remote = []
+        for ref in refs:
+            if _is_remote(ref):
+                url = f"https:{ref}" if ref.startswith("//") else ref
+                dest = os.path.join(self.cache_dir, "sources", hashlib.sha256(url.encode("utf-8")).hexdigest()[:24])
+                remote.append({"name": ref, "url": url, "dest": dest, "timeout": 15, "pin": False})
+                continue
+            for base in base_dirs:
+                path = os.path.join(base, ref.lstrip("/"))
+                if os.path.isfile(path):
+                    sources[ref] = path
+                    break
+        if remote:
+            present = fetch_assets(remote) if download else {a["name"]: os.path.exists(a["dest"]) for a in remote}
+            sources.update({a["name"]: a["dest"] for a in remote if present.get(a["name"])})
+        return sources
+
+    def _write(self, image, stem, width, fmt, options):
+        buf = io.BytesIO()
+        image.save(buf, fmt, **options)
+        data = buf.getvalue()
+        name = f"{stem}-{width}.{hashlib.sha256(data).hexdigest()[:8]}.{_EXTENSIONS[fmt]}"
+        write_output(os.path.join(self.out_dir, name), data)
+        return f"{os.path.basename(self.out_dir)}/{name}"
+
+    def _encode(self, ref, path):
+        """Return the variant descriptor for one source file, or None if it isn't a still raster image."""
+        from PIL import Image, ImageOps, UnidentifiedImageError
+
+        key = input_key(file_digest(path), self._settings)
+        cached = self._index.get(key)
+        if cached and all(os.path.exists(os.path.join(os.path.dirname(self.out_dir), p)) for p in variant_paths(cached)):
+            return key, cached
+        try:
+            with Image.open(path) as im:
+                if getattr(im, "is_animated", False):
+                    return key, None
+                im = ImageOps.exif_transpose(im)
+                im.load()
+        except (UnidentifiedImageError, OSError):
+            return key, None
+        has_alpha = im.mode in ("RGBA", "LA", "PA") or (im.mode == "P" and "transparency" in im.info)
+        im = im.convert("RGBA" if has_alpha else "RGB")
+
+        stem = _stem(ref)
+        largest_width = min(im.width, self.breakpoints[-1])
+        widths = [w for w in self.breakpoints if w < largest_width] + [largest_width]
+        resized = {w: im if w == im.width else im.resize((w, round(im.height * w / im.width)), Image.LANCZOS)
+                   for w in widths}
+        sources = [{"type": mime, "variants": [{"path": self._write(resized[w], stem, w, fmt, options), "width": w}
+                                               for w in widths]}
+                   for fmt, mime, options in self.formats]
+        largest = resized[widths[-1]]
+        if has_alpha:
+            fallback = self._write(largest, stem, widths[-1], "PNG", {"optimize": True})
+        else:
+            fallback = self._write(largest, stem, widths[-1], "JPEG", {"quality": 82, "optimize": True, "progressive": True})
+        return key, {"src": fallback, "width": largest.width, "height": largest.height, "sources": sources}
+
+    def process(self, refs, base_dirs=(".",), download=True, max_workers=None):
+        """Encode every ref that needs it and return {ref: descriptor} for the usable ones.
+        Variant files no longer referenced stay in `out_dir`: the pages still point at them
+        until they are re-rendered, so the export retires them with prune_fingerprints()."""
+        start = time.perf_counter()
+        os.makedirs(self.out_dir, exist_ok=True)
+        sources = self._sources(sorted(refs), base_dirs, download)
+        encoded = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = dict(zip(sources, pool.map(lambda item: self._encode(*item), sources.items())))
+        images, index = {}, {}
+        for ref, (key, descriptor) in results.items():
+            if descriptor is None:
+                continue
+            encoded += key not in self._index
+            images[ref] = index[key] = descriptor
+
+        self._index = index
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{self._index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self._index_path)
+        print(f"Images: {len(images)} of {len(refs)} responsive ({encoded} encoded, "
+              f"{len(images) - encoded} cached) in {time.perf_counter() - start:.2f}s.")
+        return images
+
+
+def variant_paths(descriptor):
+    """Every file (relative to the static dir) a descriptor from process() points at."""
+    return [descriptor["src"]] + [v["path"] for s in descriptor["sources"] for v in s["variants"]]
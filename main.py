@@ -1,23 +1,45 @@
-from flask import Flask, render_template, send_from_directory, Response
+from flask import Flask, render_template, send_file, Response, request, abort
+from jinja2 import pass_context
+from werkzeug.utils import safe_join
+import mimetypes
 import os
 import json
 import datetime
 import platform
-import subprocess
-import re
-import requests
-import zipfile
-import io
+import threading
+import time
+import gzip
 from urllib.parse import urljoin
-
-app = Flask(__name__, static_url_path='', static_folder='output')
-
-
-def _slugify(s):
-    """Lowercase, replace non-alphanumeric runs with single hyphens, strip edges."""
-    s = (s or "").lower().strip()
-    s = re.sub(r"[^a-z0-9]+", "-", s)
-    return s.strip("-")
+from bandcamp import BandcampCache
+from assets import configure_pinning, fetch_assets
+from build_manifest import BuildManifest, file_digest, input_key, value_digest
+from build_pool import BuildPool
+from critical_css import inline_critical_css
+from minify import minify_html
+from output_writer import write_output
+from site_data import load_site_data, split_projects
+from precompress import is_compressible, precompress_tree, precompressed_variant
+from icons import build_icon_subset, used_icon_classes
+from images import ImagePipeline, image_refs, variant_paths
+from fingerprint import MANIFEST_NAME, fingerprint_assets, prune_fingerprints, read_manifest, write_manifest
+from og_image import card_key, og_card, render_og_cards
+from preview_image import preview_format, preview_size, render_site_preview, site_preview
+from webfonts import FAMILIES as _WEBFONT_FAMILIES, build_webfonts, used_code_points, vendor_google_fonts, webfont_paths
+from tailwind import TailwindDaemon, build_css, candidates_digest, extract_candidates
+from templating import compile_templates, configure_templates
+
+try:
+    import brotli
+except ImportError:  # optional: pages are still served gzip/identity without it
+    brotli = None
+
+
+# No built-in static route: output/ is served by serve_static_root, which picks precompressed siblings
+app = Flask(__name__, static_folder=None)
+configure_templates(app)
+
+# Latest Bandcamp release, refreshed in the background so requests never wait on bandcamp.com
+_BANDCAMP = BandcampCache()
 
 
 def _render_case_study(md_path):
@@ -27,55 +49,8 @@ def _render_case_study(md_path):
         return markdown.markdown(f.read(), extensions=["fenced_code", "tables", "sane_lists"])
 
 
-def fetch_latest_bandcamp_album(artist_url):
-    """Fetch the latest album from a Bandcamp artist's discography page.
-    Returns a dict with artwork_url (embed), music_url, and music_title,
-    or None if fetching fails."""
-    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-    try:
-        # Get discography page — albums appear newest first
-        resp = requests.get(artist_url.rstrip('/') + '/music', headers=headers, timeout=10)
-        resp.raise_for_status()
-
-        album_match = re.search(r'<a href="(/album/[^"]+)">', resp.text)
-        if not album_match:
-            return None
-
-        album_path = album_match.group(1)
-        album_url = artist_url.rstrip('/') + album_path
-
-        # Get album page for embed ID and title
-        resp = requests.get(album_url, headers=headers, timeout=10)
-        resp.raise_for_status()
-
-        id_match = re.search(
-            r'<meta\s+name="bc-page-properties"\s+content="\{&quot;item_type&quot;:&quot;a&quot;,&quot;item_id&quot;:(\d+)',
-            resp.text
-        )
-        if not id_match:
-            return None
-        album_id = id_match.group(1)
-
-        title_match = re.search(r'<title>([^|]+)\|', resp.text)
-        title = title_match.group(1).strip() if title_match else album_path.replace('/album/', '').replace('-', ' ').title()
-
-        embed_url = (
-            f"https://bandcamp.com/EmbeddedPlayer/album={album_id}"
-            f"/size=large/bgcol=181a1b/linkcol=056cc4/tracklist=false/artwork=small/transparent=true/"
-        )
-
-        return {
-            "artwork_url": embed_url,
-            "music_url": album_url,
-            "music_title": title,
-        }
-    except Exception as e:
-        print(f"Warning: could not fetch latest Bandcamp album — {e}")
-        return None
-
-
 # Load and process data from the external JSON file
-def load_data():
+def _build_data():
     # Create a dummy website_data.json if it doesn't exist for demonstration
     if not os.path.exists("website_data.json"):
         dummy_data = {
@@ -209,14 +184,13 @@ def load_data():
         with open("website_data.json", "w", encoding="utf-8") as f:
             json.dump(dummy_data, f, indent=4)
 
-    with open("website_data.json", "r", encoding="utf-8") as f:
-        data = json.load(f)
+    site = load_site_data()
+    data = site.context("grouped_experience", "flat_experience", "copyright_string", "social_same_as")
 
-    # Enrich projects: slug + case_study (rendered markdown if case_studies/<slug>.md exists)
-    projects = data.get("projects", [])
+    # Enrich projects: case_study (rendered markdown if case_studies/<slug>.md exists), on copies
+    # since the site data is shared with resume.py and music.py
+    projects = data["projects"] = [dict(p) for p in site.projects]
     for p in projects:
-        if not p.get("slug"):
-            p["slug"] = _slugify(p.get("title", ""))
         md_path = os.path.join("case_studies", f"{p['slug']}.md") if p["slug"] else None
         if md_path and os.path.exists(md_path):
             p["case_study_html"] = _render_case_study(md_path)
@@ -225,49 +199,9 @@ def load_data():
             p["has_case_study"] = False
 
     # Separate featured project from others
-    data["featured_project"] = next((p for p in projects if p.get("featured")), None)
-    data["other_projects"] = [p for p in projects if not p.get("featured")]
+    data["featured_project"], data["other_projects"] = split_projects(projects)
     data["projects_with_case_studies"] = [p for p in projects if p.get("has_case_study")]
 
-    # Group experience by company
-    grouped_experience = []
-    if "experience" in data:
-        current_company = None
-        def _period_year(job):
-            m = re.search(r'\b(19|20)\d{2}\b', job.get('period', '') or '')
-            return int(m.group()) if m else 0
-        sorted_experience = sorted(data["experience"], key=_period_year, reverse=True)
-        for job in sorted_experience:
-            if job["company"] != current_company:
-                grouped_experience.append({"company": job["company"], "roles": []})
-                current_company = job["company"]
-            grouped_experience[-1]["roles"].append(
-                {"role": job["role"], "period": job["period"], "details": job.get("details", "")})
-    data["grouped_experience"] = grouped_experience
-
-    # Flat sorted experience — one entry per role, company_start flags first role per company
-    flat_experience = []
-    prev_company = None
-    for group in grouped_experience:
-        for role in group["roles"]:
-            flat_experience.append({
-                "role": role["role"],
-                "period": role["period"],
-                "details": role.get("details", ""),
-                "company": group["company"],
-                "is_company_start": group["company"] != prev_company,
-            })
-            prev_company = group["company"]
-    data["flat_experience"] = flat_experience
-
-    # Generate dynamic copyright string
-    start_year = data.get("copyright_start_year")
-    current_year = datetime.datetime.now().year
-    if start_year and start_year < current_year:
-        data["copyright_string"] = f"{start_year} - {current_year}"
-    else:
-        data["copyright_string"] = str(current_year)
-
     # OG image: prefer auto-generated og.png if present, else fall back to hero image
     site_url = data.get("site_url", "")
     og_path = os.path.join("output", "og.png")
@@ -280,37 +214,148 @@ def load_data():
         else:
             data["og_image_url"] = hero_image
 
-    # Compute sameAs list for JSON-LD
-    contact = data.get("contact_info", {})
-    data["social_same_as"] = [
-        v for k, v in contact.items()
-        if k in ("github_url", "linkedin_url") and v
-    ]
-
-    # Fetch latest Bandcamp album (falls back to existing latest_music in JSON)
-    bandcamp_url = contact.get("bandcamp_url", "")
+    # Latest Bandcamp album from the background-refreshed cache (falls back to existing latest_music in JSON)
+    bandcamp_url = data.get("contact_info", {}).get("bandcamp_url", "")
     if bandcamp_url:
-        latest = fetch_latest_bandcamp_album(bandcamp_url)
+        latest = _BANDCAMP.get(bandcamp_url)
         if latest:
             data["latest_music"] = latest
 
     return data
 
 
+# Process-wide cache of the enriched site data. load_data() only rebuilds when one
+# of its inputs (website_data.json, case_studies/*.md, output/og.png, the Bandcamp
+# cache) changes.
+_DATA_CACHE = {"signature": None, "data": None, "version": 0}
+_DATA_STATS = {"hits": 0, "rebuilds": 0, "last_rebuild_ms": 0.0, "total_rebuild_ms": 0.0}
+_DATA_LOCK = threading.Lock()
+
+
+def _data_signature():
+    """Return a cheap (path, mtime, size) fingerprint of every input _build_data() reads."""
+    def _stat(path):
+        try:
+            st = os.stat(path)
+            return (path, st.st_mtime_ns, st.st_size)
+        except OSError:
+            return (path, None, None)
+
+    entries = [_stat("website_data.json"), _stat(os.path.join("output", "og.png"))]
+    try:
+        with os.scandir("case_studies") as it:
+            md_paths = sorted(e.path for e in it if e.name.endswith(".md"))
+    except OSError:
+        md_paths = []
+    entries.extend(_stat(p) for p in md_paths)
+    # The copyright string depends on the current year, latest_music on the Bandcamp cache
+    return (tuple(entries), datetime.date.today().year, _BANDCAMP.version)
+
+
+def load_versioned_data():
+    """Return (data, version) for the enriched site data, rebuilding it only when an input
+    file changed. The dict is shared between callers — copy it before mutating."""
+    signature = _data_signature()
+    with _DATA_LOCK:
+        if _DATA_CACHE["data"] is not None and _DATA_CACHE["signature"] == signature:
+            _DATA_STATS["hits"] += 1
+            return _DATA_CACHE["data"], _DATA_CACHE["version"]
+        start = time.perf_counter()
+        data = _build_data()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        # The signature from before the build, so an input changed during it triggers another
+        # rebuild; re-stat only when _build_data() just created the missing website_data.json
+        if signature[0][0][1] is None:
+            signature = _data_signature()
+        _DATA_CACHE["signature"] = signature
+        _DATA_CACHE["data"] = data
+        _DATA_CACHE["version"] += 1
+        _DATA_STATS["rebuilds"] += 1
+        _DATA_STATS["last_rebuild_ms"] = elapsed_ms
+        _DATA_STATS["total_rebuild_ms"] += elapsed_ms
+        return data, _DATA_CACHE["version"]
+
+
+def load_data():
+    """Return the enriched site data (shared, cached — copy it before mutating)."""
+    return load_versioned_data()[0]
+
+
+def data_cache_stats():
+    """Return a snapshot of the site-data cache counters."""
+    with _DATA_LOCK:
+        return dict(_DATA_STATS, version=_DATA_CACHE["version"])
+
+
+# Whole-response cache for the HTML routes: (route, data version, tailwind_mode) ->
+# {"identity": bytes, "gzip": bytes, "br": bytes | None}. Entries for older data
+# versions are dropped as soon as a newer version is rendered.
+_PAGE_CACHE = {}
+_PAGE_LOCK = threading.Lock()
+
+
+def _templates_mtime():
+    """Newest template mtime when templates auto-reload (debug), so edits bust the page cache."""
+    if not (app.debug or app.config.get("TEMPLATES_AUTO_RELOAD")):
+        return None
+    try:
+        with os.scandir(os.path.join(app.root_path, app.template_folder)) as it:
+            return max((e.stat().st_mtime_ns for e in it), default=None)
+    except OSError:
+        return None
+
+
+def _compress_variants(body):
+    """Precompute every encoding we can serve for `body`."""
+    return {
+        "identity": body,
+        "gzip": gzip.compress(body, compresslevel=9),
+        "br": brotli.compress(body, quality=11) if brotli else None,
+    }
+
+
+def _cached_page(route, data_version, tailwind_mode, render, status=200):
+    """Serve `route` from the page cache, calling `render()` only on a miss."""
+    key = (route, data_version, tailwind_mode, _templates_mtime())
+    with _PAGE_LOCK:
+        variants = _PAGE_CACHE.get(key)
+    if variants is None:
+        variants = _compress_variants(minify_html(render()).encode("utf-8"))
+        with _PAGE_LOCK:
+            for stale in [k for k in _PAGE_CACHE if k[1:] != key[1:]]:
+                del _PAGE_CACHE[stale]
+            _PAGE_CACHE[key] = variants
+
+    encoding = "identity"
+    for candidate in ("br", "gzip"):
+        # Live reload injects into the body, so watch mode serves identity only
+        if _LIVERELOAD["enabled"]:
+            break
+        if variants[candidate] is not None and request.accept_encodings[candidate]:
+            encoding = candidate
+            break
+    response = Response(variants[encoding], status=status, mimetype="text/html")
+    if encoding != "identity":
+        response.headers["Content-Encoding"] = encoding
+    response.headers["Vary"] = "Accept-Encoding"
+    return response
+
+
 @app.route("/")
 def serve_index():
-    data = load_data()
-    return render_template('index.html', static_root="/static/", pdf_url="/resume.pdf", projects_root="/projects/", tailwind_mode="cdn", **data)
+    data, version = load_versioned_data()
+    return _cached_page("/", version, "cdn", lambda: render_template(
+        'index.html', static_root="/static/", pdf_url="/resume.pdf", projects_root="/projects/", tailwind_mode="cdn", **data))
 
 
 @app.route("/projects/<slug>/")
 def serve_case_study(slug):
-    data = load_data()
+    data, version = load_versioned_data()
     project = next((p for p in data.get("projects", []) if p.get("slug") == slug and p.get("has_case_study")), None)
     if not project:
-        from flask import abort
         abort(404)
-    return render_template('case_study.html', static_root="/static/", home_url="/", tailwind_mode="cdn", project=project, **data)
+    return _cached_page(f"/projects/{slug}/", version, "cdn", lambda: render_template(
+        'case_study.html', static_root="/static/", home_url="/", tailwind_mode="cdn", project=project, **data))
 
 
 _FALLBACK_404_DATA = {
@@ -325,28 +370,119 @@ _FALLBACK_404_DATA = {
 @app.errorhandler(404)
 def not_found(e):
     try:
-        data = load_data()
+        data, version = load_versioned_data()
     except Exception as ex:
         print(f"404 handler: load_data failed — {ex}")
-        data = _FALLBACK_404_DATA
-    return render_template('404.html', static_root="/static/", tailwind_mode="cdn", **data), 404
+        return render_template('404.html', static_root="/static/", tailwind_mode="cdn", **_FALLBACK_404_DATA), 404
+    return _cached_page("404", version, "cdn", lambda: render_template(
+        '404.html', static_root="/static/", tailwind_mode="cdn", **data), status=404)
 
 
 @app.route("/resume.pdf")
 def serve_resume():
-    from resume import generate_pdf, _load_data
-    data = _load_data()
-    pdf_bytes = generate_pdf(data)
-    return Response(
+    from resume import get_pdf
+    pdf_bytes, etag = get_pdf(load_data())
+    response = Response(
         pdf_bytes,
         mimetype="application/pdf",
         headers={"Content-Disposition": "inline; filename=resume.pdf"},
     )
+    # Always revalidate; unchanged resumes are answered with a bodiless 304
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "public, no-cache"
+    return response.make_conditional(request)
+
+
+@app.template_filter("static_url")
+@pass_context
+def static_url(context, path):
+    """URL of `path` (relative to static/) from the page being rendered: the page's static_root
+    plus the fingerprinted file name from the export's asset manifest, when there is one."""
+    hashed = (context.get("asset_manifest") or {}).get(f"static/{path}")
+    return context.get("static_root", "/static/") + (hashed[len("static/"):] if hashed else path)
+
+
+# Fingerprinted paths from output/asset-manifest.json, reloaded when the export rewrites it
+_HASHED_ASSETS = {"mtime": None, "paths": frozenset()}
+_HASHED_ASSETS_LOCK = threading.Lock()
+
+
+def _hashed_assets():
+    try:
+        mtime = os.stat(os.path.join("output", MANIFEST_NAME)).st_mtime_ns
+    except OSError:
+        return frozenset()
+    with _HASHED_ASSETS_LOCK:
+        if _HASHED_ASSETS["mtime"] != mtime:
+            _HASHED_ASSETS["paths"] = frozenset(read_manifest("output").values())
+            _HASHED_ASSETS["mtime"] = mtime
+        return _HASHED_ASSETS["paths"]
 
 
 @app.route('/<path:path>')
 def serve_static_root(path):
-    return send_from_directory('output', path)
+    full_path = safe_join('output', path)
+    if full_path is None or not os.path.isfile(full_path):
+        abort(404)
+    # Serve the .br/.gz sibling written by the export when the client accepts it: no per-request compression
+    encoding, served_path = precompressed_variant(full_path, request.accept_encodings.quality)
+    # A fingerprinted path's content never changes: let browsers and CDNs keep it for a year
+    immutable = path in _hashed_assets()
+    response = send_file(served_path, mimetype=mimetypes.guess_type(full_path)[0] or "application/octet-stream",
+                         conditional=True, max_age=31536000 if immutable else None)
+    if immutable:
+        response.cache_control.immutable = True
+    if is_compressible(full_path):
+        response.vary.add("Accept-Encoding")
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+
+# Live reload for --watch: browsers hold an SSE connection to /__livereload and
+# reload when a rebuild bumps the generation counter.
+_LIVERELOAD = {"enabled": False, "generation": 0}
+_LIVERELOAD_COND = threading.Condition()
+_LIVERELOAD_SNIPPET = (
+    b'<script>new EventSource("/__livereload").onmessage = function () { location.reload(); };</script>'
+)
+
+
+def _notify_reload():
+    with _LIVERELOAD_COND:
+        _LIVERELOAD["generation"] += 1
+        _LIVERELOAD_COND.notify_all()
+
+
+@app.route("/__livereload")
+def livereload_events():
+    if not _LIVERELOAD["enabled"]:
+        abort(404)
+
+    def stream():
+        seen = _LIVERELOAD["generation"]
+        while True:
+            with _LIVERELOAD_COND:
+                _LIVERELOAD_COND.wait_for(lambda: _LIVERELOAD["generation"] != seen, timeout=15)
+                generation = _LIVERELOAD["generation"]
+            if generation != seen:
+                seen = generation
+                yield "data: reload\n\n"
+            else:
+                yield ": keep-alive\n\n"
+
+    return Response(stream(), mimetype="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@app.after_request
+def inject_livereload(response):
+    if not _LIVERELOAD["enabled"] or response.mimetype != "text/html" or "Content-Encoding" in response.headers:
+        return response
+    response.direct_passthrough = False
+    body = response.get_data()
+    if b"</body>" in body:
+        response.set_data(body.replace(b"</body>", _LIVERELOAD_SNIPPET + b"</body>", 1))
+    return response
 
 
 _TAILWIND_VERSION = "v3.4.17"
@@ -359,8 +495,11 @@ _TAILWIND_BINARIES = {
     ("linux",   "arm64"): "tailwindcss-linux-arm64",
 }
 
-def _get_tailwind_cli(static_dir):
-    """Download the Tailwind standalone CLI if not already present; return its path."""
+_TAILWIND_RELEASE_URL = "https://github.com/tailwindlabs/tailwindcss/releases/download/{version}/{binary}"
+
+
+def _tailwind_cli_asset(static_dir):
+    """Return the asset spec for the Tailwind standalone CLI matching this platform."""
     system = platform.system().lower()
     machine = platform.machine().lower()
     # Normalise arm variants
@@ -372,266 +511,416 @@ def _get_tailwind_cli(static_dir):
     if not binary_name:
         raise RuntimeError(f"No Tailwind CLI binary for {system}/{arch}")
     local_name = "tailwindcss.exe" if system == "windows" else "tailwindcss"
-    cli_path = os.path.join(static_dir, local_name)
-    if not os.path.exists(cli_path):
-        url = f"https://github.com/tailwindlabs/tailwindcss/releases/download/{_TAILWIND_VERSION}/{binary_name}"
-        print(f"Downloading Tailwind CLI {_TAILWIND_VERSION}...")
-        resp = requests.get(url, timeout=120)
-        resp.raise_for_status()
-        with open(cli_path, "wb") as f:
-            f.write(resp.content)
-        if system != "windows":
-            os.chmod(cli_path, 0o755)
-        print("Downloaded Tailwind CLI.")
-    return cli_path
-
-
-def _build_tailwind_css(cli_path, content_html_paths, output_css_path):
-    """Run the Tailwind CLI to generate a purged, minified CSS file.
-    content_html_paths can be a single path or a list of paths."""
-    if isinstance(content_html_paths, str):
-        content_html_paths = [content_html_paths]
-    abs_paths = [os.path.abspath(p) for p in content_html_paths]
-    config_js = os.path.join(os.path.dirname(output_css_path), "_tailwind_config.js")
-    input_css = os.path.join(os.path.dirname(output_css_path), "_tailwind_input.css")
-    try:
-        with open(config_js, "w", encoding="utf-8") as f:
-            f.write(f"""module.exports = {{
-  darkMode: 'class',
-  content: {json.dumps(abs_paths)},
-  theme: {{
-    extend: {{
-      fontFamily: {{ sans: ['Inter', 'sans-serif'], heading: ['Poppins', 'sans-serif'] }},
-      keyframes: {{ flash: {{ '0%, 100%': {{ backgroundColor: 'transparent' }}, '50%': {{ backgroundColor: 'rgba(59, 130, 246, 0.2)' }} }} }},
-      animation: {{ flash: 'flash 1s ease-in-out' }},
-    }},
-  }},
-}}
-""")
-        with open(input_css, "w", encoding="utf-8") as f:
-            f.write("@tailwind base;\n@tailwind components;\n@tailwind utilities;\n")
-        result = subprocess.run(
-            [cli_path, "-i", input_css, "-o", output_css_path, "--config", config_js, "--minify"],
-            capture_output=True, text=True
-        )
-        if result.returncode != 0:
-            raise RuntimeError(result.stderr.strip())
-        print(f"Built tailwind.css ({os.path.getsize(output_css_path) // 1024} KB).")
-        return True
-    finally:
-        for p in (config_js, input_css):
-            try:
-                os.remove(p)
-            except OSError:
-                pass
+    return {
+        "name": f"Tailwind CLI {_TAILWIND_VERSION}",
+        "url": _TAILWIND_RELEASE_URL.format(version=_TAILWIND_VERSION, binary=binary_name),
+        "dest": os.path.join(static_dir, local_name),
+        "timeout": 120,
+        "executable": system != "windows",
+    }
 
 
-_OG_FONT_CANDIDATES = {
-    "bold":    ["Inter-Bold.ttf", "arialbd.ttf", "Arial Bold.ttf", "DejaVuSans-Bold.ttf", "Helvetica-Bold.ttf"],
-    "regular": ["Inter-Regular.ttf", "arial.ttf", "Arial.ttf", "DejaVuSans.ttf", "Helvetica.ttf"],
-}
-
-
-def _load_og_font(weight, size):
-    """Return a TrueType font in the requested weight at `size`, or Pillow's bundled default."""
-    from PIL import ImageFont
-    for name in _OG_FONT_CANDIDATES[weight]:
-        try:
-            return ImageFont.truetype(name, size)
-        except (OSError, IOError):
-            continue
-    return ImageFont.load_default(size=size)
-
-
-def _hex_rgb(hex_str, default=(0, 0, 0)):
-    h = (hex_str or "").lstrip("#")
-    if len(h) == 3:
-        h = "".join(c * 2 for c in h)
-    if len(h) != 6:
-        return default
+def _get_tailwind_cli(static_dir, download=True):
+    """Download the Tailwind standalone CLI if not already present; return its path."""
+    asset = _tailwind_cli_asset(static_dir)
+    if not download and not os.path.exists(asset["dest"]):
+        raise RuntimeError(f"{asset['name']} is not downloaded")
+    if not fetch_assets([asset])[asset["name"]]:
+        raise RuntimeError(f"could not download {asset['name']}")
+    return asset["dest"]
+
+
+_FA_VERSION = "6.4.0"
+_FA_ZIP_URL = f"https://use.fontawesome.com/releases/v{_FA_VERSION}/fontawesome-free-{_FA_VERSION}-web.zip"
+# Versioned URLs so the SHA-256 pins in assets.lock.json stay valid
+_TAILWIND_CDN_URL = f"https://cdn.tailwindcss.com/{_TAILWIND_VERSION.lstrip('v')}"
+_SORTABLE_URL = "https://cdn.jsdelivr.net/npm/sortablejs@1.15.2/Sortable.min.js"
+
+
+def _remote_assets(static_dir):
+    """Asset specs for every remote download the static export needs (see assets.fetch_assets)."""
+    assets = [
+        {"name": f"Font Awesome v{_FA_VERSION}", "url": _FA_ZIP_URL,
+         "dest": os.path.join(static_dir, f"fontawesome-free-{_FA_VERSION}-web"), "extract_to": static_dir},
+        {"name": "tailwindcss.js", "url": _TAILWIND_CDN_URL,
+         "dest": os.path.join(static_dir, "tailwindcss.js"), "timeout": 10},
+        {"name": "Sortable.min.js", "url": _SORTABLE_URL,
+         "dest": os.path.join(static_dir, "Sortable.min.js"), "timeout": 10},
+    ]
     try:
-        return (int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16))
-    except ValueError:
-        return default
-
+        assets.append(_tailwind_cli_asset(static_dir))
+    except RuntimeError as e:
+        print(f"Skipping Tailwind CLI download: {e}")
+    return assets
+
+
+def _strip_case_study_html(value):
+    """Copy of `value` without rendered case-study bodies, so site-wide output keys
+    don't change when only one case study's Markdown is edited."""
+    if isinstance(value, dict):
+        return {k: _strip_case_study_html(v) for k, v in value.items() if k != "case_study_html"}
+    if isinstance(value, list):
+        return [_strip_case_study_html(v) for v in value]
+    return value
+
+
+def _postprocess_page(html, critical_css_path=None, minify=True):
+    """Post-render optimisation stage for exported pages."""
+    if critical_css_path:
+        # Inline above-the-fold rules, load the full stylesheets without blocking render
+        with open(critical_css_path, "r", encoding="utf-8") as f:
+            html = inline_critical_css(html, f.read())
+    if minify:
+        html = minify_html(html)
+    return html
+
+
+def _render_page_job(output_path, template_name, context, postprocess=None):
+    """Build-pool job: render one template to `output_path`, then run the post-render
+    stage with the `postprocess` options. Returns the page size in bytes."""
+    with app.app_context():
+        rendered = render_template(template_name, **context)
+    before = len(rendered.encode("utf-8"))
+    rendered = _postprocess_page(rendered, **(postprocess or {}))
+    body = rendered.encode("utf-8")
+    print(f"{output_path}: {before / 1024:.1f} KB -> {len(body) / 1024:.1f} KB "
+          f"({(len(body) - before) * 100 / max(before, 1):+.0f}%)")
+    write_output(output_path, body)
+    return len(body)
 
-def _generate_og_image(data, output_path):
-    """Render a 1200x630 PNG: name + subtitle on theme-colored background with accent glow."""
-    from PIL import Image, ImageDraw, ImageFilter
 
-    W, H = 1200, 630
-    dark = data.get("theme_colors", {}).get("dark", {})
-    bg = _hex_rgb(dark.get("background"), (17, 24, 39))
-    text_primary = _hex_rgb(dark.get("text_primary"), (249, 250, 251))
-    text_secondary = _hex_rgb(dark.get("text_secondary"), (209, 213, 219))
-    accent = _hex_rgb(dark.get("accent"), (147, 197, 253))
-    accent_hover = _hex_rgb(dark.get("accent_hover"), (96, 165, 250))
+def _og_cards_job(jobs):
+    """Build-pool job: render a batch of (card, output_path) Open Graph cards.
+    Returns how many were drawn rather than copied from the cache."""
+    return sum(render_og_cards(jobs).values())
 
-    img = Image.new("RGB", (W, H), bg)
 
-    # Two soft accent glows for depth (lower-right + upper-left)
-    glow = Image.new("RGBA", (W, H), (0, 0, 0, 0))
-    g = ImageDraw.Draw(glow)
-    g.ellipse([(W * 0.55, H * 0.25), (W * 1.15, H * 1.15)], fill=accent + (170,))
-    g.ellipse([(-W * 0.15, -H * 0.25), (W * 0.35, H * 0.45)], fill=accent_hover + (90,))
-    glow = glow.filter(ImageFilter.GaussianBlur(radius=90))
-    img = Image.alpha_composite(img.convert("RGBA"), glow).convert("RGB")
+def _resume_pdf_job(data, output_path):
+    """Build-pool job: render the resume PDF. Returns (pdf_bytes, cache key) so the parent
+    can seed its own resume cache for /resume.pdf."""
+    from resume import get_pdf
+    pdf_bytes, key = get_pdf(data)
+    write_output(output_path, pdf_bytes)
+    return pdf_bytes, key
 
-    draw = ImageDraw.Draw(img)
-    name_font = _load_og_font("bold", 110)
-    sub_font = _load_og_font("regular", 38)
 
-    name = data.get("hero_title") or "Portfolio"
-    sub = data.get("hero_subtitle") or ""
-    if len(sub) > 70:
-        sub = sub[:67].rstrip() + "..."
+# Templates the portfolio renders (music.html belongs to music.py)
+_PAGE_TEMPLATES = ("index.html", "404.html", "case_study.html")
 
-    margin_x = 80
-    draw.text((margin_x, 250), name, font=name_font, fill=text_primary)
-    draw.rectangle([(margin_x, 380), (margin_x + 80, 384)], fill=accent)
-    draw.text((margin_x, 400), sub, font=sub_font, fill=text_secondary)
+# Modules whose code shapes the exported pages; editing one invalidates the build manifest
+_BUILD_MODULES = ("main.py", "critical_css.py", "minify.py")
 
-    img.save(output_path, "PNG", optimize=True)
+# Long-lived Tailwind CLI shared by every build of this process (see use_tailwind_daemon)
+_TAILWIND_DAEMON = None
 
 
-def write_static_html():
+def write_static_html(incremental=False, jobs=None, fetch_remote=True, use_tailwind_daemon=False):
     """
     Generates the static HTML file and downloads remote assets to a local
     'static' directory if they don't already exist.
+
+    With incremental=True, outputs whose inputs (data fields, templates, Markdown,
+    assets) hash the same as in output/.build_manifest.json are left untouched.
+    The OG image, pages and resume PDF are rendered on a process pool of `jobs`
+    workers (default: one per core; 1 builds serially). fetch_remote=False skips
+    all downloads (watch-mode rebuilds reuse whatever assets are already present).
+    use_tailwind_daemon=True compiles CSS through a persistent `tailwindcss --watch`
+    process instead of a fresh CLI run per build.
     """
+    global _TAILWIND_DAEMON
     output_dir = "output"
     static_dir = os.path.join(output_dir, "static")
     os.makedirs(static_dir, exist_ok=True)
-
-    fa_version = "6.4.0"
-    fa_zip_url = f"https://use.fontawesome.com/releases/v{fa_version}/fontawesome-free-{fa_version}-web.zip"
-    fa_extract_path = os.path.join(static_dir, f"fontawesome-free-{fa_version}-web")
-
-    if not os.path.exists(fa_extract_path):
-        try:
-            print(f"Downloading Font Awesome v{fa_version}...")
-            response = requests.get(fa_zip_url, timeout=30)
-            response.raise_for_status()
-
-            print("Extracting Font Awesome...")
-            with zipfile.ZipFile(io.BytesIO(response.content)) as z:
-                z.extractall(static_dir)
-            print("Successfully downloaded and extracted Font Awesome.")
-
-        except requests.exceptions.RequestException as e:
-            print(f"Error downloading Font Awesome: {e}")
-        except zipfile.BadZipFile:
-            print("Error: Downloaded file is not a valid zip file.")
-
-    tailwind_url = "https://cdn.tailwindcss.com"
-    tailwind_local_path = os.path.join(static_dir, "tailwindcss.js")
-    if not os.path.exists(tailwind_local_path):
+    build_start = time.perf_counter()
+    manifest = BuildManifest(os.path.join(output_dir, ".build_manifest.json"), enabled=incremental)
+
+    # --- Remote assets, fetched concurrently ---
+    if fetch_remote:
+        fetch_assets(_remote_assets(static_dir))
+
+    # A full build is worth waiting for a due Bandcamp refresh; incremental builds use the cache
+    bandcamp_url = load_data().get("contact_info", {}).get("bandcamp_url", "")
+    if bandcamp_url and not incremental:
+        _BANDCAMP.ensure_fresh(bandcamp_url)
+
+    # Copy: the export mutates og_image_url and load_data() returns the shared cached dict
+    data = dict(load_data())
+    case_studies = data["projects_with_case_studies"] = [dict(p) for p in data.get("projects_with_case_studies", [])]
+
+    # Code changes invalidate everything built by these modules
+    code_digest = input_key(*(file_digest(os.path.join(app.root_path, m)) for m in _BUILD_MODULES))
+    template_digests = {name: file_digest(os.path.join(app.root_path, app.template_folder, name))
+                        for name in _PAGE_TEMPLATES}
+
+    # --- Open Graph cards ---
+    # The site card plus one per case study, rendered in batches on the build pool while
+    # Tailwind runs; pages point at their card unless it fails
+    og_output_path = os.path.join(output_dir, "og.png")
+    dark = data.get("theme_colors", {}).get("dark", {})
+    og_cards = {og_output_path: og_card(data.get("hero_title"), data.get("hero_subtitle"), dark)}
+    fallback_og_image_url = data.get("og_image_url")
+    site_url = data.get("site_url", "")
+    data["og_image_url"] = urljoin(site_url, "og.png") if site_url else "og.png"
+    for project in case_studies:
+        card_path = os.path.join(output_dir, "projects", project["slug"], "og.png")
+        og_cards[card_path] = og_card(project.get("title"), project.get("description"), dark,
+                                      kicker=data.get("hero_title"))
+        project["og_image_url"] = urljoin(site_url, f"projects/{project['slug']}/og.png") if site_url else "og.png"
+
+    with BuildPool(max_workers=jobs) as pool:
+        stale_cards = [(card, path) for path, card in og_cards.items()
+                       if not manifest.is_fresh(path, card_key(card), always_check=True)]
+        # One batch per worker, so each worker sets up fonts and the background once
+        og_batches = [stale_cards[i::pool.max_workers] for i in range(min(pool.max_workers, len(stale_cards)))]
+        for i, batch in enumerate(og_batches):
+            pool.submit(f"og-cards-{i}", _og_cards_job, batch)
+
+        # --- Tailwind CSS build ---
+        # Render with CDN mode so all class names are present, then extract candidates in-process.
+        # The CLI only runs when the candidate set differs from the one tailwind.css was built from.
+        scan_pages = [
+            render_template('index.html', static_root="static/", pdf_url="resume.pdf", projects_root="projects/", tailwind_mode="cdn", **data),
+            render_template('404.html', static_root="static/", tailwind_mode="cdn", **data),
+        ]
+        if case_studies:
+            scan_pages.append(render_template('case_study.html', static_root="../../static/", home_url="../../", tailwind_mode="cdn", project=case_studies[0], **data))
+        candidates = extract_candidates(*scan_pages)
+        tailwind_css_path = os.path.join(static_dir, "tailwind.css")
+        tailwind_key = input_key(_TAILWIND_VERSION, candidates_digest(candidates))
+        tailwind_mode = "cdn"
+        if manifest.is_fresh(tailwind_css_path, tailwind_key, always_check=True):
+            tailwind_mode = "built"
+            print(f"tailwind.css up to date ({len(candidates)} class candidates unchanged).")
+        else:
+            try:
+                cli_path = _get_tailwind_cli(static_dir, download=fetch_remote)
+                if use_tailwind_daemon:
+                    if _TAILWIND_DAEMON is None:
+                        _TAILWIND_DAEMON = TailwindDaemon(cli_path, tailwind_css_path)
+                    _TAILWIND_DAEMON.build(candidates)
+                else:
+                    build_css(cli_path, candidates, tailwind_css_path)
+                manifest.record(tailwind_css_path, tailwind_key)
+                tailwind_mode = "built"
+            except Exception as e:
+                manifest.forget(tailwind_css_path)
+                print(f"Tailwind CLI build failed, falling back to CDN bundle: {e}")
+
+        for i, batch in enumerate(og_batches):
+            og_result = pool.result(f"og-cards-{i}")
+            for card, path in batch:
+                if og_result.ok:
+                    manifest.record(path, card_key(card))
+                else:
+                    manifest.forget(path)
+            if not og_result.ok:
+                print(f"Warning: could not generate {len(batch)} OG card(s) — {og_result.error}")
+        if not os.path.exists(og_output_path):
+            data["og_image_url"] = fallback_og_image_url
+        for project in case_studies:
+            if not os.path.exists(os.path.join(output_dir, "projects", project["slug"], "og.png")):
+                del project["og_image_url"]
+
+        # --- Font Awesome subset ---
+        # Icons come from the rendered pages plus every icon field in the data (other case studies)
+        fa_dir = os.path.join(static_dir, f"fontawesome-free-{_FA_VERSION}-web")
+        fa_subset_dir = os.path.join(static_dir, "fontawesome")
+        icon_classes = used_icon_classes(*scan_pages, json.dumps(data))
+        fa_subset_css = os.path.join(fa_subset_dir, "css", "icons.min.css")
+        fa_key = input_key(_FA_VERSION, value_digest(sorted(icon_classes)),
+                           *(file_digest(os.path.join(app.root_path, m)) for m in ("icons.py", "font_subset.py", "critical_css.py")))
+        if os.path.isdir(fa_dir):
+            try:
+                if not manifest.is_fresh(fa_subset_css, fa_key, always_check=True):
+                    build_icon_subset(fa_dir, fa_subset_dir, icon_classes)
+                    manifest.record(fa_subset_css, fa_key)
+                data["fontawesome_css"] = os.path.relpath(fa_subset_css, static_dir).replace(os.sep, "/")
+            except Exception as e:
+                manifest.forget(fa_subset_css)
+                print(f"Warning: could not subset Font Awesome, shipping the full set — {e}")
+
+        # --- Self-hosted web fonts ---
+        # Subset to every character on the scanned pages and in the data; Google Fonts is the fallback
+        fonts_dir = os.path.join(static_dir, "fonts")
+        fonts_css = os.path.join(fonts_dir, "fonts.css")
+        code_points = used_code_points(*scan_pages, json.dumps(data, ensure_ascii=False))
         try:
-            print(f"Downloading tailwindcss.js...")
-            response = requests.get(tailwind_url, timeout=10)
-            response.raise_for_status()
-            with open(tailwind_local_path, "w", encoding="utf-8") as f:
-                f.write(response.text)
-            print(f"Successfully downloaded tailwindcss.js.")
-        except requests.exceptions.RequestException as e:
-            print(f"Error downloading tailwindcss.js: {e}")
-
-    sortable_url = "https://cdn.jsdelivr.net/npm/sortablejs@latest/Sortable.min.js"
-    sortable_local_path = os.path.join(static_dir, "Sortable.min.js")
-    if not os.path.exists(sortable_local_path):
+            faces = vendor_google_fonts(_WEBFONT_FAMILIES, os.path.join(".cache", "webfonts"), download=fetch_remote)
+            fonts_key = input_key(value_digest(faces), value_digest(sorted(code_points)),
+                                  *(file_digest(os.path.join(app.root_path, m)) for m in ("webfonts.py", "font_subset.py")))
+            if manifest.is_fresh(fonts_css, fonts_key, always_check=True):
+                data["webfonts"] = webfont_paths(faces, fonts_dir)
+            else:
+                data["webfonts"] = build_webfonts(faces, fonts_dir, code_points)
+                manifest.record(fonts_css, fonts_key)
+        except Exception as e:
+            manifest.forget(fonts_css)
+            print(f"Warning: could not self-host web fonts, using Google Fonts — {e}")
+
+        # --- Responsive images ---
+        # Hashed AVIF/WebP variants per breakpoint; images that can't be processed keep their plain <img>
         try:
-            print("Downloading Sortable.min.js...")
-            response = requests.get(sortable_url, timeout=10)
-            response.raise_for_status()
-            with open(sortable_local_path, "w", encoding="utf-8") as f:
-                f.write(response.text)
-            print("Successfully downloaded Sortable.min.js.")
-        except requests.exceptions.RequestException as e:
-            print(f"Error downloading Sortable.min.js: {e}")
-
-    data = load_data()
-
-    # --- Open Graph image ---
-    og_output_path = os.path.join(output_dir, "og.png")
-    try:
-        _generate_og_image(data, og_output_path)
-        print(f"og.png written ({os.path.getsize(og_output_path) // 1024} KB).")
-        # Re-resolve og_image_url now that the file exists
-        site_url = data.get("site_url", "")
-        data["og_image_url"] = urljoin(site_url, "og.png") if site_url else "og.png"
-    except Exception as e:
-        print(f"Warning: could not generate og.png — {e}")
-
-    # --- Tailwind CSS build ---
-    # Step 1: render with CDN mode so all class names are in the HTML for scanning
-    scan_html_path = os.path.join(output_dir, "_scan.html")
-    scan_404_path = os.path.join(output_dir, "_scan_404.html")
-    scan_cs_path = os.path.join(output_dir, "_scan_cs.html")
-    scan_html = render_template('index.html', static_root="static/", pdf_url="resume.pdf", projects_root="projects/", tailwind_mode="cdn", **data)
-    scan_404 = render_template('404.html', static_root="static/", tailwind_mode="cdn", **data)
-    case_studies = data.get("projects_with_case_studies", [])
-    if case_studies:
-        scan_cs = render_template('case_study.html', static_root="../../static/", home_url="../../", tailwind_mode="cdn", project=case_studies[0], **data)
-        with open(scan_cs_path, "w", encoding="utf-8") as f:
-            f.write(scan_cs)
-    with open(scan_html_path, "w", encoding="utf-8") as f:
-        f.write(scan_html)
-    with open(scan_404_path, "w", encoding="utf-8") as f:
-        f.write(scan_404)
-
-    tailwind_css_path = os.path.join(static_dir, "tailwind.css")
-    tailwind_mode = "cdn"
-    scan_inputs = [scan_html_path, scan_404_path]
-    if case_studies:
-        scan_inputs.append(scan_cs_path)
-    try:
-        cli_path = _get_tailwind_cli(static_dir)
-        _build_tailwind_css(cli_path, scan_inputs, tailwind_css_path)
-        tailwind_mode = "built"
-    except Exception as e:
-        print(f"Tailwind CLI build failed, falling back to CDN bundle: {e}")
-    finally:
-        for p in (scan_html_path, scan_404_path, scan_cs_path):
+            pipeline = ImagePipeline(os.path.join(static_dir, "img"), os.path.join(".cache", "images"))
+            data["images"] = pipeline.process(image_refs(data), base_dirs=(output_dir, app.root_path),
+                                              download=fetch_remote)
+        except Exception as e:
+            print(f"Warning: could not build responsive images — {e}")
+
+        # --- Live-preview thumbnails ---
+        # One light and one dark screenshot of the home page stand in for every live-preview
+        # iframe until the card is hovered; projects fall back to a blank frame without them
+        preview_paths = []
+        if any(p.get("live_preview") for p in data.get("projects", [])):
+            hero = data.get("images", {}).get(data.get("hero_image_url"))
+            hero_path = os.path.join(static_dir, hero["src"]) if hero else None
             try:
-                os.remove(p)
-            except OSError:
-                pass
-
-    # Step 2: render final HTML with the determined tailwind_mode
-    rendered_for_file = render_template('index.html', static_root="static/", pdf_url="resume.pdf", projects_root="projects/", tailwind_mode=tailwind_mode, **data)
-    rendered_404 = render_template('404.html', static_root="static/", tailwind_mode=tailwind_mode, **data)
-
-    index_path = os.path.join(output_dir, "index.html")
-    with open(index_path, "w", encoding="utf-8") as f:
-        f.write(rendered_for_file)
-    with open(os.path.join(output_dir, "404.html"), "w", encoding="utf-8") as f:
-        f.write(rendered_404)
-
-    # Render case study pages: output/projects/<slug>/index.html
-    for project in case_studies:
-        slug_dir = os.path.join(output_dir, "projects", project["slug"])
-        os.makedirs(slug_dir, exist_ok=True)
-        rendered_cs = render_template('case_study.html', static_root="../../static/", home_url="../../", tailwind_mode=tailwind_mode, project=project, **data)
-        with open(os.path.join(slug_dir, "index.html"), "w", encoding="utf-8") as f:
-            f.write(rendered_cs)
-        print(f"case study written: projects/{project['slug']}/")
-
-    # Export resume PDF
-    try:
-        from resume import generate_pdf
-        pdf_bytes = generate_pdf(data)
+                previews = {}
+                for theme in ("light", "dark"):
+                    rel_path = f"previews/site-{theme}.{preview_format()[1]}"
+                    render_site_preview(site_preview(data, theme, hero_path), os.path.join(static_dir, rel_path))
+                    previews[theme] = rel_path
+                width, height = preview_size()
+                data["site_previews"] = dict(previews, width=width, height=height)
+                preview_paths = list(previews.values())
+            except Exception as e:
+                print(f"Warning: could not render live-preview thumbnails — {e}")
+
+        # --- Asset fingerprinting ---
+        # Pages link name.<hash>.ext copies, which serve_static_root (or any host) can cache for good
+        static_assets = ["tailwind.css", "tailwindcss.js", "Sortable.min.js", "icon.png",
+                         data.get("fontawesome_css", f"fontawesome-free-{_FA_VERSION}-web/css/all.min.css"),
+                         *preview_paths]
+        if data.get("webfonts"):
+            static_assets += [data["webfonts"]["css"], data["webfonts"]["sandbox_css"], *data["webfonts"]["preload"]]
+        og_paths = [os.path.relpath(p, output_dir).replace(os.sep, "/") for p in og_cards]
+        asset_manifest = fingerprint_assets(output_dir, [f"static/{a}" for a in static_assets] + og_paths)
+        # Image variants are content-hashed already; listing them lets prune_fingerprints retire old ones
+        for descriptor in data.get("images", {}).values():
+            asset_manifest.update({f"static/{p}": f"static/{p}" for p in variant_paths(descriptor)})
+        # Written (and older copies pruned) only after the pages that reference it
+        previous_asset_manifest = read_manifest(output_dir)
+        data["asset_manifest"] = asset_manifest
+        if "og.png" in asset_manifest:
+            data["og_image_url"] = urljoin(site_url, asset_manifest["og.png"]) if site_url else asset_manifest["og.png"]
+        for project in case_studies:
+            hashed = asset_manifest.get(f"projects/{project['slug']}/og.png")
+            if hashed:
+                project["og_image_url"] = urljoin(site_url, hashed) if site_url else os.path.basename(hashed)
+
+        # Everything but the case-study bodies feeds every page
+        site_digest = value_digest(_strip_case_study_html(data))
+
+        # Step 2: render final pages and the resume PDF in parallel with the determined tailwind_mode
+        postprocess = {}
+        if tailwind_mode == "built":
+            postprocess["critical_css_path"] = tailwind_css_path
+        postprocess_digest = input_key(tailwind_mode, *(file_digest(p) for p in postprocess.values()))
+
+        page_keys = {}
+        index_path = os.path.join(output_dir, "index.html")
+        index_key = input_key(code_digest, site_digest, template_digests["index.html"], postprocess_digest)
+        if not manifest.is_fresh(index_path, index_key):
+            page_keys[index_path] = index_key
+            pool.submit(index_path, _render_page_job, index_path, 'index.html', dict(
+                static_root="static/", pdf_url="resume.pdf", projects_root="projects/", tailwind_mode=tailwind_mode, **data),
+                postprocess)
+
+        path_404 = os.path.join(output_dir, "404.html")
+        key_404 = input_key(code_digest, site_digest, template_digests["404.html"], postprocess_digest)
+        if not manifest.is_fresh(path_404, key_404):
+            page_keys[path_404] = key_404
+            pool.submit(path_404, _render_page_job, path_404, '404.html', dict(
+                static_root="static/", tailwind_mode=tailwind_mode, **data), postprocess)
+
+        # Case study pages: output/projects/<slug>/index.html
+        for project in case_studies:
+            cs_path = os.path.join(output_dir, "projects", project["slug"], "index.html")
+            cs_key = input_key(code_digest, site_digest, template_digests["case_study.html"], postprocess_digest,
+                               value_digest(project.get("case_study_html", "")))
+            if not manifest.is_fresh(cs_path, cs_key):
+                page_keys[cs_path] = cs_key
+                pool.submit(cs_path, _render_page_job, cs_path, 'case_study.html', dict(
+                    static_root="../../static/", home_url="../../", tailwind_mode=tailwind_mode, project=project, **data),
+                    postprocess)
+
+        # Resume PDF
         pdf_path = os.path.join(output_dir, "resume.pdf")
-        with open(pdf_path, "wb") as f:
-            f.write(pdf_bytes)
-        print("resume.pdf written to output/")
-    except Exception as e:
-        print(f"Warning: could not generate resume.pdf — {e}")
+        try:
+            from resume import resume_cache_key
+            pdf_key = input_key(file_digest(os.path.join(app.root_path, "resume.py")), resume_cache_key(data))
+            if not manifest.is_fresh(pdf_path, pdf_key):
+                page_keys[pdf_path] = pdf_key
+                pool.submit(pdf_path, _resume_pdf_job, data, pdf_path)
+        except Exception as e:
+            manifest.forget(pdf_path)
+            print(f"Warning: could not generate resume.pdf — {e}")
+
+        for path, result in pool.wait_all().items():
+            if path not in page_keys:
+                continue
+            if path == pdf_path and result.ok:
+                # Rendered in a worker process: hand the bytes to this process's cache too
+                from resume import cache_pdf
+                cache_pdf(result.value[1], result.value[0])
+            if result.ok:
+                manifest.record(path, page_keys[path])
+            else:
+                manifest.forget(path)
+
+    # --- Retire old fingerprints ---
+    # Pages on disk now point at the new names; the previous generation stays for cached pages
+    write_manifest(output_dir, asset_manifest)
+    pruned = prune_fingerprints(output_dir, asset_manifest, previous_asset_manifest, hashed_dirs=["static/img"])
+    if pruned:
+        print(f"Removed {pruned} superseded fingerprinted files.")
+
+    # --- Precompression: .gz/.br siblings for the static host and serve_static_root ---
+    precompress_tree(output_dir)
+
+    manifest.save()
+    if incremental:
+        print(f"Incremental build: {len(manifest.rebuilt)} rebuilt, {len(manifest.skipped)} up to date "
+              f"({(time.perf_counter() - build_start) * 1000:.0f} ms).")
 
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Export the static site to output/ and run the dev server.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only rebuild outputs whose inputs changed since the last export")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="worker processes for rendering (default: one per core, 1 = serial)")
+    parser.add_argument("--watch", action="store_true",
+                        help="rebuild incrementally when data, templates or case studies change and live-reload browsers")
+    parser.add_argument("--pin-assets", action="store_true",
+                        help="record the SHA-256 of downloaded assets missing from assets.lock.json")
+    parser.add_argument("--require-pins", action="store_true",
+                        help="fail downloads of assets missing from assets.lock.json (for CI)")
+    args = parser.parse_args()
+
+    configure_pinning(pin_new=args.pin_assets or None, require=args.require_pins or None)
+
+    # Compiled before the export so the spawned build workers load bytecode from .cache/jinja
+    compile_templates(app, _PAGE_TEMPLATES)
     with app.app_context():
-        write_static_html()
+        write_static_html(incremental=args.incremental or args.watch, jobs=args.jobs)
         print(f"Static HTML file and assets generated in 'output/' directory.")
 
+    if args.watch:
+        from watcher import PollingWatcher
+
+        def _rebuild(changed):
+            print(f"Changed: {', '.join(changed)}")
+            # Small rebuilds finish faster inline than on a freshly started process pool
+            with app.app_context():
+                write_static_html(incremental=True, jobs=args.jobs or 1, fetch_remote=False,
+                                  use_tailwind_daemon=True)
+            _notify_reload()
+
+        _LIVERELOAD["enabled"] = True
+        PollingWatcher(["website_data.json", app.template_folder, "case_studies"], _rebuild).start()
+        print("Watching website_data.json, templates/ and case_studies/ for changes.")
+
     print("Starting development server at http://localhost:5000")
-    app.run(debug=True)
+    # The watcher replaces the code reloader, which would restart (and fully re-export) on every save
+    app.run(debug=True, use_reloader=not args.watch, threaded=True)
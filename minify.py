@@ -0,0 +1,193 @@
+"""
+minify.py — Conservative HTML, inline-JS and inline-CSS minification.
+
+Usage:
+    small = minify_html(html)
+
+HTML: comments are dropped (except conditional comments), whitespace runs collapse
+to one space (or one line break), and whitespace next to block-level and head tags
+is removed; around inline elements it is kept as a single space.
+<pre>, <textarea> and <code> content (case-study code blocks) is left byte-for-byte
+alone.
+
+Inline <script>: comments and indentation are removed and blank lines dropped, but
+line breaks are kept so automatic semicolon insertion still sees the same code.
+Strings, template literals and regex literals are copied unchanged. Scripts
+with a non-JavaScript type (application/ld+json, templates, import maps) are only
+trimmed.
+
+Inline <style>: comments are removed, whitespace is collapsed and spaces around
+{ } ; , > and after : are dropped.
+"""
+
+import re
+
+
+# Only elements that start a new line box: whitespace around inline and replaced elements
+# (<svg>, <img>, <iframe>, <select>, <br>, ...) is rendered, so it is collapsed, not removed
+_BLOCK_TAGS = (
+    "html|head|body|title|meta|link|script|style|noscript|base|div|section|header|footer|nav|main|"
+    "article|aside|ul|ol|li|dl|dt|dd|p|h[1-6]|table|caption|colgroup|col|thead|tbody|tfoot|tr|td|th|"
+    "form|fieldset|legend|hr|figure|figcaption|blockquote|details|summary|dialog|template"
+)
+_RAW_RE = re.compile(r"<(pre|textarea|code|script|style)\b([^>]*)>(.*?)</\1\s*>", re.IGNORECASE | re.DOTALL)
+_COMMENT_RE = re.compile(r"<!--(?!\[if)(?!<!).*?-->", re.DOTALL)
+_SPACE_RE = re.compile(r"\s+")
+_BLOCK_SPACE_RE = re.compile(r"\s*(</?(?:%s)\b[^>]*>)\s*" % _BLOCK_TAGS, re.IGNORECASE)
+_TYPE_RE = re.compile(r"""\btype\s*=\s*["']?([^"'\s>]+)""", re.IGNORECASE)
+_JS_TYPES = {"", "text/javascript", "application/javascript", "module"}
+
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+_CSS_STRING_RE = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')""")
+_CSS_PUNCT_RE = re.compile(r"\s*([{};,>])\s*")
+_CSS_COLON_RE = re.compile(r":\s+")
+
+# After one of these, a "/" starts a regex literal rather than a division
+_REGEX_PRECEDERS = set("(,=:[!&|?{};+-*%<>~^") | {""}
+_REGEX_KEYWORDS = ("return", "typeof", "case", "do", "else", "in", "of", "void", "yield", "await")
+
+
+def minify_css(css):
+    """Drop comments and redundant whitespace from a stylesheet (string literals are kept as-is)."""
+    parts = _CSS_STRING_RE.split(_CSS_COMMENT_RE.sub("", css))
+    for i in range(0, len(parts), 2):
+        part = _SPACE_RE.sub(" ", parts[i])
+        part = _CSS_PUNCT_RE.sub(r"\1", part)
+        parts[i] = _CSS_COLON_RE.sub(":", part).replace(";}", "}")
+    return "".join(parts).strip()
+
+
+def _skip_string(js, i, quote):
+    """Index just past the string starting at js[i] (the opening quote)."""
+    i += 1
+    while i < len(js):
+        c = js[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == quote or (c == "\n" and quote != "`"):
+            return i + 1
+        if quote == "`" and js.startswith("${", i):
+            i = _skip_braces(js, i + 2)
+            continue
+        i += 1
+    return i
+
+
+def _skip_braces(js, i):
+    """Index just past the `}` closing a template-literal substitution that starts at js[i]."""
+    depth = 1
+    while i < len(js) and depth:
+        c = js[i]
+        if c in "'\"`":
+            i = _skip_string(js, i, c)
+            continue
+        if c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+        i += 1
+    return i
+
+
+def _skip_regex(js, i):
+    """Index just past the regex literal starting at js[i] (the opening slash), including flags."""
+    i += 1
+    in_class = False
+    while i < len(js) and js[i] != "\n":
+        c = js[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == "[":
+            in_class = True
+        elif c == "]":
+            in_class = False
+        elif c == "/" and not in_class:
+            i += 1
+            while i < len(js) and js[i].isalpha():
+                i += 1
+            return i
+        i += 1
+    return i
+
+
+def _previous_token(out):
+    """The last significant character (or keyword) already emitted, for regex detection."""
+    text = "".join(out[-8:]).rstrip()
+    if not text:
+        return ""
+    for kw in _REGEX_KEYWORDS:
+        if text.endswith(kw) and (len(text) == len(kw) or not (text[-len(kw) - 1].isalnum() or text[-len(kw) - 1] in "_$")):
+            return "("
+    return text[-1]
+
+
+def minify_js(js):
+    """Strip comments, indentation and blank lines from a script, leaving line breaks,
+    strings, template literals and regex literals untouched."""
+    out = []
+    i, n = 0, len(js)
+    while i < n:
+        c = js[i]
+        if c in "'\"`":
+            end = _skip_string(js, i, c)
+            out.append(js[i:end])
+            i = end
+        elif js.startswith("//", i):
+            end = js.find("\n", i)
+            i = n if end < 0 else end
+        elif js.startswith("/*", i):
+            end = js.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            out.append(" ")
+        elif c == "/" and _previous_token(out) in _REGEX_PRECEDERS:
+            end = _skip_regex(js, i)
+            out.append(js[i:end])
+            i = end
+        elif c == "\n":
+            # Drop trailing spaces on the line just finished and indentation on the next
+            while out and out[-1] in (" ", "\t"):
+                out.pop()
+            if out and out[-1] != "\n":
+                out.append("\n")
+            i += 1
+            while i < n and js[i] in " \t\r\n":
+                i += 1
+        elif c in " \t\r":
+            if out and out[-1] not in (" ", "\n"):
+                out.append(" ")
+            i += 1
+        else:
+            out.append(c)
+            i += 1
+    return "".join(out).strip()
+
+
+def minify_html(html):
+    """Return `html` minified; content of <pre>, <textarea>, <code> and non-JS scripts is preserved."""
+    raw = []
+
+    def protect(m):
+        tag, attrs, body = m.group(1).lower(), m.group(2), m.group(3)
+        if tag == "script":
+            script_type = _TYPE_RE.search(attrs)
+            if (script_type.group(1).lower() if script_type else "") in _JS_TYPES:
+                body = minify_js(body)
+            else:
+                body = body.strip()
+        elif tag == "style":
+            body = minify_css(body)
+        raw.append(f"<{m.group(1)}{attrs}>{body}</{m.group(1)}>")
+        return f"\x00{len(raw) - 1}\x00"
+
+    html = _RAW_RE.sub(protect, html)
+    html = _COMMENT_RE.sub("", html)
+    # A run containing a line break stays a line break, so inline handlers keep their ASI behaviour
+    html = _SPACE_RE.sub(lambda m: "\n" if "\n" in m.group(0) else " ", html)
+    html = _BLOCK_SPACE_RE.sub(r"\1", html)
+    # Placeholders stand for <script>/<style>/<pre>... which are block-level too (except <code>)
+    html = re.sub(r"\s*(\x00\d+\x00)\s*",
+                  lambda m: m.group(1) if not raw[int(m.group(1)[1:-1])].lower().startswith("<code") else m.group(0),
+                  html)
+    return re.sub(r"\x00(\d+)\x00", lambda m: raw[int(m.group(1))], html).strip()
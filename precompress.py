@@ -0,0 +1,121 @@
+"""
+precompress.py — Write .gz and .br siblings for the compressible files of a static export.
+
+Usage:
+    precompress_tree("output")                     -> writes output/index.html.gz, .br, ...
+    encoding, path = precompressed_variant("output/index.html", request.accept_encodings.quality)
+
+Every text-like file (HTML, CSS, JS, JSON, SVG, TrueType ...) gets a gzip -9 and,
+when the brotli package is installed, a brotli quality 11 sibling, as long as the
+compressed copy is actually smaller. Siblings carry their source's mtime, so
+unchanged files are skipped on the next run and stale siblings are never served.
+Files are compressed in parallel; siblings whose source is gone are removed.
+"""
+
+import gzip
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import brotli
+except ImportError:  # optional: only .gz siblings without it
+    brotli = None
+
+
+COMPRESSIBLE_EXTENSIONS = {
+    ".html", ".css", ".js", ".mjs", ".json", ".map", ".svg", ".txt", ".xml", ".webmanifest",
+    ".ttf", ".otf", ".eot", ".ico",
+}
+# (Accept-Encoding token, sibling suffix), preferred first
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+_MIN_SIZE = 256
+
+
+def is_compressible(path):
+    return os.path.splitext(path)[1].lower() in COMPRESSIBLE_EXTENSIONS
+
+
+def _compress(data, encoding):
+    if encoding == "br":
+        return brotli.compress(data, quality=11)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _is_current(source_stat, sibling):
+    try:
+        return os.stat(sibling).st_mtime_ns == source_stat.st_mtime_ns
+    except OSError:
+        return False
+
+
+def _precompress_file(path):
+    """Write the siblings of one file. Returns (original bytes, {encoding: bytes written}) or None if skipped."""
+    st = os.stat(path)
+    encodings = [(enc, suffix) for enc, suffix in ENCODINGS if enc != "br" or brotli is not None]
+    if all(_is_current(st, path + suffix) for _, suffix in encodings):
+        return None
+    with open(path, "rb") as f:
+        data = f.read()
+    sizes = {}
+    for enc, suffix in encodings:
+        sibling = path + suffix
+        compressed = _compress(data, enc)
+        if len(compressed) >= len(data):
+            if os.path.exists(sibling):
+                os.remove(sibling)
+            continue
+        tmp_path = f"{sibling}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(compressed)
+        os.utime(tmp_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        os.replace(tmp_path, sibling)
+        sizes[enc] = len(compressed)
+    return len(data), sizes
+
+
+def precompress_tree(root, max_workers=None):
+    """Precompress every compressible file under `root` that changed since the last run."""
+    start = time.perf_counter()
+    sources, siblings = [], []
+    for dirpath, dirnames, filenames in os.walk(root):
+        # Build bookkeeping such as .build_manifest.json isn't deployed content
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            if name.startswith("."):
+                continue
+            if name.endswith((".gz", ".br")):
+                siblings.append(path)
+            elif is_compressible(name) and os.path.getsize(path) >= _MIN_SIZE:
+                sources.append(path)
+
+    # Siblings of deleted or no-longer-compressible files
+    wanted = set(sources)
+    for path in siblings:
+        if path[:-3] not in wanted:
+            os.remove(path)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = [r for r in pool.map(_precompress_file, sources) if r is not None]
+    original = sum(size for size, _ in results)
+    totals = ", ".join(f"{enc} {sum(sizes.get(enc, 0) for _, sizes in results) // 1024} KB"
+                       for enc, _ in ENCODINGS if enc != "br" or brotli is not None)
+    print(f"Precompressed {len(results)} files ({len(sources) - len(results)} unchanged) in "
+          f"{time.perf_counter() - start:.2f}s: {original // 1024} KB -> {totals}.")
+    return len(results)
+
+
+def precompressed_variant(path, quality):
+    """Return (encoding, sibling path) of the best current sibling of `path` for which
+    `quality(token)` is non-zero (e.g. request.accept_encodings.quality), or (None, path)."""
+    if not is_compressible(path):
+        return None, path
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None, path
+    for enc, suffix in ENCODINGS:
+        if quality(enc) and _is_current(st, path + suffix):
+            return enc, path + suffix
+    return None, path
@@ -0,0 +1,177 @@
+"""
+preview_image.py — Prerendered thumbnails standing in for the live-preview iframes.
+
+Usage:
+    preview = site_preview(data, "dark", hero_image_path="output/static/img/me-640.1a2b3c4d.jpg")
+    render_site_preview(preview, "output/static/previews/site-dark.webp")   -> True if drawn
+
+Project cards with `live_preview` used to embed the whole site in a scaled-down
+iframe, so every such card loaded every page asset again. The export now draws
+a Pillow composite of the top of the home page instead (nav bar, hero text and
+portrait in the theme colours) and the page only swaps the real iframe in when
+the card is hovered or focused. The live previews all show the same page, so
+one thumbnail per theme covers every card.
+
+Renders are cached under .cache/previews/<preview_key>.<ext>, keyed on the
+drawn text, colours, portrait bytes, fonts and this module.
+"""
+
+import functools
+import os
+
+from build_manifest import file_digest, input_key, value_digest
+from og_image import _font, _font_path, _hex_rgb
+from output_writer import copy_output
+
+
+# The iframe viewport and the part of it a project card shows (h-40 at scale 0.38)
+VIEWPORT_W = 1280
+CROP_H = 440
+PREVIEW_SCALE = 0.38
+CACHE_DIR = os.path.join(".cache", "previews")
+
+_NAV_LINKS = ("About", "Experience", "Skills", "Certifications", "Projects", "Contact")
+# Drawn at 2x the displayed size so it stays sharp on high-DPI screens
+_OUTPUT_SCALE = PREVIEW_SCALE * 2
+
+
+@functools.lru_cache(maxsize=None)
+def preview_format():
+    """("WEBP", "webp") when this Pillow build can encode WebP, else ("PNG", "png")."""
+    from PIL import features
+    return ("WEBP", "webp") if features.check("webp") else ("PNG", "png")
+
+
+def preview_size():
+    """(width, height) in CSS pixels the thumbnail is displayed at."""
+    return round(VIEWPORT_W * PREVIEW_SCALE), round(CROP_H * PREVIEW_SCALE)
+
+
+def site_preview(data, theme, hero_image_path=None):
+    """The inputs of one thumbnail: the home page's hero content in the `theme` ("light"/"dark") colours."""
+    colors = data.get("theme_colors", {}).get(theme, {})
+    return {
+        "theme": theme,
+        "portfolio_name": data.get("portfolio_name") or data.get("hero_title") or "",
+        "title": data.get("hero_title") or "",
+        "subtitle": data.get("hero_subtitle") or "",
+        "about": data.get("about_me") or "",
+        "hero_image": hero_image_path if hero_image_path and os.path.isfile(hero_image_path) else None,
+        "colors": {k: colors.get(k) for k in ("background", "text_primary", "text_secondary", "card_background", "accent")},
+    }
+
+
+def preview_key(preview):
+    """Hash of everything that affects the rendered thumbnail."""
+    fonts = [file_digest(p) if p else "default" for p in (_font_path("bold"), _font_path("regular"))]
+    image = file_digest(preview["hero_image"]) if preview["hero_image"] else "none"
+    return input_key(value_digest({k: v for k, v in preview.items() if k != "hero_image"}), image,
+                     *fonts, file_digest(__file__))
+
+
+def _wrap(draw, text, font, width, max_lines):
+    """Greedy word wrap of `text` to `width` pixels, ellipsised after `max_lines` lines."""
+    lines, line = [], ""
+    for word in text.split():
+        candidate = f"{line} {word}".strip()
+        if line and draw.textlength(candidate, font=font) > width:
+            lines.append(line)
+            line = word
+        else:
+            line = candidate
+    if line:
+        lines.append(line)
+    if len(lines) > max_lines:
+        lines = lines[:max_lines]
+        lines[-1] = lines[-1].rstrip(".,;: ") + "..."
+    return lines
+
+
+def _portrait(path, size, border, border_color):
+    """The hero image cropped to a circle of `size` px with a `border` px ring, as RGBA."""
+    from PIL import Image, ImageDraw, ImageOps
+
+    with Image.open(path) as im:
+        im = ImageOps.fit(ImageOps.exif_transpose(im).convert("RGB"), (size, size), Image.LANCZOS)
+    out = Image.new("RGBA", (size + 2 * border, size + 2 * border), (0, 0, 0, 0))
+    mask = Image.new("L", out.size, 0)
+    ImageDraw.Draw(mask).ellipse([(0, 0), (out.width - 1, out.height - 1)], fill=255)
+    out.paste(Image.new("RGBA", out.size, border_color + (255,)), (0, 0), mask)
+    inner = Image.new("L", (size, size), 0)
+    ImageDraw.Draw(inner).ellipse([(0, 0), (size - 1, size - 1)], fill=255)
+    out.paste(im, (border, border), inner)
+    return out
+
+
+def _draw(preview, output_path):
+    from PIL import Image, ImageDraw
+
+    dark = preview["theme"] == "dark"
+    colors = preview["colors"]
+    bg = _hex_rgb(colors.get("background"), (17, 24, 39) if dark else (249, 250, 251))
+    card_bg = _hex_rgb(colors.get("card_background"), (31, 41, 55) if dark else (255, 255, 255))
+    text_primary = _hex_rgb(colors.get("text_primary"), (249, 250, 251) if dark else (17, 24, 39))
+    text_secondary = _hex_rgb(colors.get("text_secondary"), (209, 213, 219) if dark else (75, 85, 99))
+    accent = _hex_rgb(colors.get("accent"), (147, 197, 253) if dark else (37, 99, 235))
+
+    img = Image.new("RGB", (VIEWPORT_W, CROP_H), bg)
+    draw = ImageDraw.Draw(img)
+
+    # Nav bar: portfolio name left, section links and the theme button right
+    draw.rectangle([(0, 0), (VIEWPORT_W, 72)], fill=bg)
+    draw.line([(0, 72), (VIEWPORT_W, 72)], fill=card_bg, width=2)
+    draw.text((48, 22), preview["portfolio_name"], font=_font("bold", 24), fill=text_primary)
+    link_font = _font("regular", 16)
+    x = VIEWPORT_W - 48 - 44
+    draw.rounded_rectangle([(x, 18), (x + 44, 54)], radius=6, fill=card_bg)
+    for label in reversed(_NAV_LINKS):
+        x -= 32 + draw.textlength(label, font=link_font)
+        draw.text((x, 27), label, font=link_font, fill=text_primary)
+
+    # Hero: portrait right, title/subtitle/about/button left, centred as a group like md:flex-row
+    portrait_size, gap = 256, 64
+    text_w = 560
+    left = (VIEWPORT_W - (text_w + gap + portrait_size + 8)) // 2
+    top = 80 + 128
+    if preview["hero_image"]:
+        try:
+            portrait = _portrait(preview["hero_image"], portrait_size, 4, (55, 65, 81) if dark else (255, 255, 255))
+            img.paste(portrait, (left + text_w + gap, top - 20), portrait)
+        except OSError:
+            pass
+
+    size = 60
+    while size > 36 and draw.textlength(preview["title"], font=_font("bold", size)) > text_w:
+        size -= 4
+    draw.text((left, top), preview["title"], font=_font("bold", size), fill=text_primary)
+    y = top + size + 12
+    for line in _wrap(draw, preview["subtitle"], _font("bold", 24), text_w, 2):
+        draw.text((left, y), line, font=_font("bold", 24), fill=accent)
+        y += 32
+    y += 16
+    for line in _wrap(draw, preview["about"], _font("regular", 18), text_w, 3):
+        draw.text((left, y), line, font=_font("regular", 18), fill=text_secondary)
+        y += 28
+    y += 24
+    button_font = _font("bold", 16)
+    draw.rounded_rectangle([(left, y), (left + 48 + draw.textlength("Download Resume", font=button_font), y + 48)],
+                           radius=8, fill=accent)
+    draw.text((left + 24, y + 14), "Download Resume", font=button_font, fill=(255, 255, 255))
+
+    img = img.resize((round(VIEWPORT_W * _OUTPUT_SCALE), round(CROP_H * _OUTPUT_SCALE)), Image.LANCZOS)
+    fmt, _ = preview_format()
+    img.save(output_path, fmt, **({"quality": 80, "method": 6} if fmt == "WEBP" else {"optimize": True}))
+
+
+def render_site_preview(preview, output_path, cache_dir=CACHE_DIR):
+    """Write the thumbnail for `preview` to `output_path`, reusing the cached render if the
+    inputs are unchanged. Returns True if it was drawn, False if it came from the cache."""
+    cached = os.path.join(cache_dir, f"{preview_key(preview)}.{preview_format()[1]}")
+    drawn = not os.path.exists(cached)
+    if drawn:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{cached}.{os.getpid()}.tmp"
+        _draw(preview, tmp_path)
+        os.replace(tmp_path, cached)
+    copy_output(cached, output_path)
+    return drawn
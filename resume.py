@@ -3,45 +3,28 @@ resume.py — Generate a PDF resume from website_data.json using fpdf2.
 
 Usage:
     python resume.py              -> writes output/resume.pdf
-    generate_pdf(data) -> bytes   -> call from Flask route
+    generate_pdf(data) -> bytes   -> build a PDF from scratch
+    get_pdf(data) -> (bytes, etag) -> cached build, shared by the Flask route and static export
 """
 
 import os
 import json
 import datetime
+import hashlib
+import threading
 from fpdf import FPDF, XPos, YPos
 
+from output_writer import write_output
+from site_data import load_site_data
+
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
 def _load_data():
-    """Load and pre-process website_data.json (mirrors main.py logic)."""
-    with open("website_data.json", "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    # Group experience by company, sorted newest-first
-    grouped_experience = []
-    if "experience" in data:
-        current_company = None
-        sorted_exp = sorted(data["experience"], key=lambda x: int(x["period"][:4]), reverse=True)
-        for job in sorted_exp:
-            if job["company"] != current_company:
-                grouped_experience.append({"company": job["company"], "roles": []})
-                current_company = job["company"]
-            grouped_experience[-1]["roles"].append({
-                "role": job["role"],
-                "period": job["period"],
-                "details": job.get("details", ""),
-            })
-    data["grouped_experience"] = grouped_experience
-
-    projects = data.get("projects", [])
-    data["featured_project"] = next((p for p in projects if p.get("featured")), None)
-    data["other_projects"] = [p for p in projects if not p.get("featured")]
-
-    return data
+    """website_data.json with the views generate_pdf() reads (shared with main.py via site_data)."""
+    return load_site_data().context("grouped_experience", "featured_project", "other_projects")
 
 
 # ---------------------------------------------------------------------------
@@ -116,10 +99,18 @@ def _build_contact_line(data: dict) -> str:
     return "  |  ".join(parts)
 
 
+def _generation_month() -> datetime.datetime:
+    """Midnight UTC on the first of the current month: the PDF's footer date and CreationDate."""
+    return datetime.datetime.now(datetime.timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
 def generate_pdf(data: dict) -> bytes:
     """Generate resume PDF from pre-processed data dict. Returns raw bytes."""
 
     pdf = ResumePDF()
+    # Pinned to the month in the footer (and the cache key), so one key always yields the same bytes
+    generated = _generation_month()
+    pdf.set_creation_date(generated)
     pdf.add_page()
 
     # ---- Header -----------------------------------------------------------
@@ -254,14 +245,71 @@ def generate_pdf(data: dict) -> bytes:
 
     # ---- Footer -----------------------------------------------------------
     pdf.set_y(-12)
-    now = datetime.datetime.now().strftime("%B %Y")
     pdf.set_font("Helvetica", "I", 7.5)
     pdf.set_text_color(*ResumePDF.MUTED)
-    pdf.cell(0, 5, f"Generated {now}", align="C")
+    pdf.cell(0, 5, f"Generated {generated:%B %Y}", align="C")
 
     return bytes(pdf.output())
 
 
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+_PDF_CACHE = {}          # content hash -> PDF bytes
+_PDF_CACHE_MAX = 4
+_PDF_LOCK = threading.Lock()
+
+
+def _resume_inputs(data: dict) -> dict:
+    """Extract exactly the fields generate_pdf() reads, so unrelated edits keep the cache warm."""
+    projects = []
+    if data.get("featured_project"):
+        projects.append(data["featured_project"])
+    projects.extend(data.get("other_projects", []))
+    contact = data.get("contact_info", {})
+    return {
+        "hero_title": data.get("hero_title", ""),
+        "hero_subtitle": data.get("hero_subtitle", ""),
+        "contact": [contact.get(k) for k in ("github_url", "linkedin_url", "email")],
+        "about_me": data.get("about_me", ""),
+        "grouped_experience": data.get("grouped_experience", []),
+        "projects": [[p.get(k) for k in ("title", "tech_stack", "description", "url")] for p in projects],
+        "skills": [s["name"] for s in data.get("skills", [])],
+        "domain_knowledge": [[d.get("name"), d.get("description")] for d in data.get("domain_knowledge", [])],
+        "certifications": [[c.get(k) for k in ("name", "description", "link")] for c in data.get("certifications", [])],
+        # The footer prints the generation month
+        "generated": f"{_generation_month():%B %Y}",
+    }
+
+
+def resume_cache_key(data: dict) -> str:
+    """SHA-256 of the resume-relevant fields of `data`; doubles as a strong ETag."""
+    payload = json.dumps(_resume_inputs(data), sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cache_pdf(key: str, pdf_bytes: bytes):
+    """Store a PDF rendered elsewhere (a build-pool worker) under its resume_cache_key()."""
+    with _PDF_LOCK:
+        if key not in _PDF_CACHE and len(_PDF_CACHE) >= _PDF_CACHE_MAX:
+            _PDF_CACHE.clear()
+        _PDF_CACHE[key] = pdf_bytes
+
+
+def get_pdf(data: dict):
+    """Return (pdf_bytes, etag), rebuilding only when the resume-relevant data changed."""
+    key = resume_cache_key(data)
+    with _PDF_LOCK:
+        pdf_bytes = _PDF_CACHE.get(key)
+        if pdf_bytes is None:
+            pdf_bytes = generate_pdf(data)
+            if len(_PDF_CACHE) >= _PDF_CACHE_MAX:
+                _PDF_CACHE.clear()
+            _PDF_CACHE[key] = pdf_bytes
+    return pdf_bytes, key
+
+
 # ---------------------------------------------------------------------------
 # CLI entry point
 # ---------------------------------------------------------------------------
@@ -270,8 +318,6 @@ if __name__ == "__main__":
     data = _load_data()
     pdf_bytes = generate_pdf(data)
 
-    os.makedirs("output", exist_ok=True)
     out_path = os.path.join("output", "resume.pdf")
-    with open(out_path, "wb") as f:
-        f.write(pdf_bytes)
+    write_output(out_path, pdf_bytes)
     print(f"PDF written to {out_path}")
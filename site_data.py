@@ -0,0 +1,136 @@
+"""
+site_data.py — website_data.json, parsed once, with derived views computed on demand.
+
+Usage:
+    site = load_site_data()               -> the same SiteData until the file changes
+    site.raw["hero_title"]
+    site.grouped_experience               -> computed on first access, then memoised
+    site.context("grouped_experience", "copyright_string")   -> raw fields + those views
+
+main.py, resume.py and music.py all read the site data through here, so the JSON
+is parsed once per change per process and the shared transformations (project
+slugs and the featured/other split, experience grouping, the copyright string)
+live in one place. SiteData and its views are shared between callers: copy
+before mutating.
+"""
+
+import datetime
+import functools
+import json
+import os
+import re
+import threading
+
+
+DATA_PATH = "website_data.json"
+
+_YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+
+# path -> (signature, SiteData)
+_SITE_CACHE = {}
+_SITE_LOCK = threading.Lock()
+
+
+def slugify(s):
+    """Lowercase, replace non-alphanumeric runs with single hyphens, strip edges."""
+    s = (s or "").lower().strip()
+    s = re.sub(r"[^a-z0-9]+", "-", s)
+    return s.strip("-")
+
+
+def period_year(period):
+    """First year in a period string ("2019 - Present", "Jan 2021 – Mar 2022"), or 0 if there is none."""
+    m = _YEAR_RE.search(period or "")
+    return int(m.group()) if m else 0
+
+
+def split_projects(projects):
+    """(featured project or None, the other projects)."""
+    return (next((p for p in projects if p.get("featured")), None),
+            [p for p in projects if not p.get("featured")])
+
+
+def group_experience(experience):
+    """Roles newest-first, grouped into consecutive runs per company."""
+    grouped = []
+    current_company = None
+    for job in sorted(experience, key=lambda job: period_year(job.get("period")), reverse=True):
+        if job["company"] != current_company:
+            grouped.append({"company": job["company"], "roles": []})
+            current_company = job["company"]
+        grouped[-1]["roles"].append({"role": job["role"], "period": job["period"], "details": job.get("details", "")})
+    return grouped
+
+
+class SiteData:
+    """One parse of website_data.json. Derived views are cached properties."""
+
+    def __init__(self, raw, year=None):
+        self.raw = raw
+        self.year = year or datetime.date.today().year
+
+    @functools.cached_property
+    def projects(self):
+        """Copies of the projects, each with a slug."""
+        return [dict(p, slug=p.get("slug") or slugify(p.get("title", ""))) for p in self.raw.get("projects", [])]
+
+    @functools.cached_property
+    def featured_project(self):
+        return split_projects(self.projects)[0]
+
+    @functools.cached_property
+    def other_projects(self):
+        return split_projects(self.projects)[1]
+
+    @functools.cached_property
+    def grouped_experience(self):
+        return group_experience(self.raw.get("experience", []))
+
+    @functools.cached_property
+    def flat_experience(self):
+        """One entry per role, is_company_start flagging the first role of each company run."""
+        flat = []
+        prev_company = None
+        for group in self.grouped_experience:
+            for role in group["roles"]:
+                flat.append(dict(role, company=group["company"], is_company_start=group["company"] != prev_company))
+                prev_company = group["company"]
+        return flat
+
+    @functools.cached_property
+    def copyright_string(self):
+        start_year = self.raw.get("copyright_start_year")
+        if start_year and start_year < self.year:
+            return f"{start_year} - {self.year}"
+        return str(self.year)
+
+    @functools.cached_property
+    def social_same_as(self):
+        """Profile URLs for the JSON-LD sameAs list."""
+        contact = self.raw.get("contact_info", {})
+        return [v for k, v in contact.items() if k in ("github_url", "linkedin_url") and v]
+
+    def context(self, *views):
+        """A new dict of the raw fields plus the named views."""
+        return dict(self.raw, **{name: getattr(self, name) for name in views})
+
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+        return (st.st_mtime_ns, st.st_size, datetime.date.today().year)
+    except OSError:
+        return None
+
+
+def load_site_data(path=DATA_PATH):
+    """The SiteData for `path`, re-parsed only when the file (or the year) changed."""
+    signature = _signature(path)
+    with _SITE_LOCK:
+        cached = _SITE_CACHE.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        with open(path, "r", encoding="utf-8") as f:
+            site = SiteData(json.load(f))
+        _SITE_CACHE[path] = (signature, site)
+        return site
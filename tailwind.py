@@ -0,0 +1,223 @@
+"""
+tailwind.py — In-process class extraction and CLI builds for the purged Tailwind CSS.
+
+Usage:
+    candidates = extract_candidates(index_html, page_404_html)
+    digest = candidates_digest(candidates)     -> unchanged digest means unchanged CSS
+    build_css(cli_path, candidates, "output/static/tailwind.css")
+
+    daemon = TailwindDaemon(cli_path, "output/static/tailwind.css")
+    daemon.build(candidates)                    -> incremental recompile in a long-lived CLI
+
+The rendered pages are tokenised here rather than written to disk for the CLI to
+re-scan; the CLI only receives the candidate set (inline, as raw content).
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import re
+import subprocess
+import threading
+import time
+
+from output_writer import copy_output
+
+
+# Same idea as Tailwind's default extractor: any run of characters that can't end
+# an attribute value, string or tag. Over-matching is harmless — the CLI discards
+# candidates that aren't utilities.
+_CANDIDATE_RE = re.compile(r"""[^<>"'`\s]*[^<>"'`\s:]""")
+_MAX_CANDIDATE_LEN = 200
+
+_CONFIG_TEMPLATE = """module.exports = {{
+  darkMode: 'class',
+  content: {content},
+  theme: {{
+    extend: {{
+      fontFamily: {{ sans: ['Inter', 'sans-serif'], heading: ['Poppins', 'sans-serif'] }},
+      keyframes: {{ flash: {{ '0%, 100%': {{ backgroundColor: 'transparent' }}, '50%': {{ backgroundColor: 'rgba(59, 130, 246, 0.2)' }} }} }},
+      animation: {{ flash: 'flash 1s ease-in-out' }},
+    }},
+  }},
+}}
+"""
+_INPUT_CSS = "@tailwind base;\n@tailwind components;\n@tailwind utilities;\n"
+
+
+def extract_candidates(*documents):
+    """Return the set of Tailwind class candidates found in the given rendered strings."""
+    candidates = set()
+    for doc in documents:
+        for token in _CANDIDATE_RE.findall(doc):
+            if len(token) <= _MAX_CANDIDATE_LEN and any(c.isalpha() for c in token):
+                candidates.add(token)
+    return candidates
+
+
+def candidates_digest(candidates):
+    """SHA-256 over the sorted candidate set and the Tailwind config/input it is compiled with."""
+    sha = hashlib.sha256()
+    sha.update(_CONFIG_TEMPLATE.encode("utf-8"))
+    sha.update(_INPUT_CSS.encode("utf-8"))
+    for candidate in sorted(candidates):
+        sha.update(candidate.encode("utf-8"))
+        sha.update(b"\n")
+    return sha.hexdigest()
+
+
+def config_js(content):
+    """Tailwind config with the given `content` entries (file globs or {raw, extension} objects)."""
+    return _CONFIG_TEMPLATE.format(content=json.dumps(content))
+
+
+def build_css(cli_path, candidates, output_css_path):
+    """Run the Tailwind CLI once to generate a purged, minified CSS file for `candidates`."""
+    work_dir = os.path.dirname(output_css_path)
+    config_path = os.path.join(work_dir, "_tailwind_config.js")
+    input_css = os.path.join(work_dir, "_tailwind_input.css")
+    # The CLI writes in place; it builds into a temp file that is swapped in once complete
+    built_css = os.path.join(work_dir, "._tailwind_output.css")
+    raw = {"raw": " ".join(sorted(candidates)), "extension": "html"}
+    try:
+        with open(config_path, "w", encoding="utf-8") as f:
+            f.write(config_js([raw]))
+        with open(input_css, "w", encoding="utf-8") as f:
+            f.write(_INPUT_CSS)
+        result = subprocess.run(
+            [cli_path, "-i", input_css, "-o", built_css, "--config", config_path, "--minify"],
+            capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip())
+        copy_output(built_css, output_css_path)
+        print(f"Built tailwind.css ({os.path.getsize(output_css_path) // 1024} KB).")
+        return True
+    finally:
+        for p in (config_path, input_css, built_css):
+            try:
+                os.remove(p)
+            except OSError:
+                pass
+
+
+class TailwindDaemon:
+    """A long-lived `tailwindcss --watch` process for repeated builds.
+
+    The CLI is started once with a config whose only content path is a candidates
+    file; each build() rewrites that file and waits for the CLI's incremental
+    recompile. The process is health-checked before every build, restarted if it
+    died, and shut down cleanly with stop() (also registered with atexit)."""
+
+    def __init__(self, cli_path, output_css_path, work_dir=os.path.join(".cache", "tailwind"), timeout=30):
+        self.cli_path = cli_path
+        self.output_css_path = output_css_path
+        self.work_dir = work_dir
+        self.timeout = timeout
+        self.restarts = 0
+        self._proc = None
+        self._builds = 0
+        self._errors = []
+        self._cond = threading.Condition()
+        self._candidates_path = os.path.abspath(os.path.join(work_dir, "candidates.html"))
+        # The CLI rewrites its output in place on every change; builds are copied out atomically
+        self._built_css = os.path.abspath(os.path.join(work_dir, "tailwind.css"))
+        atexit.register(self.stop)
+
+    def is_alive(self):
+        return self._proc is not None and self._proc.poll() is None
+
+    def _start(self, candidates):
+        os.makedirs(self.work_dir, exist_ok=True)
+        config_path = os.path.join(self.work_dir, "tailwind.config.js")
+        input_css = os.path.join(self.work_dir, "input.css")
+        with open(config_path, "w", encoding="utf-8") as f:
+            f.write(config_js([self._candidates_path]))
+        with open(input_css, "w", encoding="utf-8") as f:
+            f.write(_INPUT_CSS)
+        self._write_candidates(candidates)
+        with self._cond:
+            self._builds = 0
+            self._errors = []
+        # stdin stays open: the v3 CLI exits its watch loop when stdin closes, which stop() relies on
+        self._proc = subprocess.Popen(
+            [self.cli_path, "-i", input_css, "-o", self._built_css,
+             "--config", config_path, "--minify", "--watch"],
+            stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+        )
+        threading.Thread(target=self._read_stderr, args=(self._proc,), name="tailwind-stderr", daemon=True).start()
+        self._wait_for_build(0)
+
+    def _read_stderr(self, proc):
+        for line in proc.stderr:
+            with self._cond:
+                if line.startswith("Done in"):
+                    self._builds += 1
+                    self._errors = []
+                elif line.strip() and not line.startswith(("Rebuilding", "Browserslist")):
+                    self._errors.append(line.strip())
+                self._cond.notify_all()
+        with self._cond:
+            self._cond.notify_all()
+
+    def _wait_for_build(self, seen, candidates=None):
+        """Block until the CLI reports a build after `seen`. If `candidates` is given, the file is
+        rewritten every second meanwhile, in case the change landed before the CLI's watcher was ready."""
+        start = time.monotonic()
+        deadline = start + self.timeout
+        next_touch = start + 1.0
+        with self._cond:
+            while self._builds == seen:
+                if not self.is_alive():
+                    raise RuntimeError(f"Tailwind daemon exited: {' '.join(self._errors)}".strip())
+                now = time.monotonic()
+                if now >= deadline:
+                    raise RuntimeError(f"Tailwind daemon timed out after {self.timeout}s")
+                if candidates is not None and now >= next_touch:
+                    self._write_candidates(candidates)
+                    next_touch = now + 1.0
+                self._cond.wait(min(deadline - now, 0.25))
+
+    def _write_candidates(self, candidates):
+        with open(self._candidates_path, "w", encoding="utf-8") as f:
+            f.write(" ".join(sorted(candidates)))
+
+    def build(self, candidates):
+        """Recompile tailwind.css for `candidates`, (re)starting the CLI if it isn't running."""
+        start = time.perf_counter()
+        built = False
+        if self.is_alive():
+            with self._cond:
+                seen = self._builds
+            self._write_candidates(candidates)
+            try:
+                self._wait_for_build(seen, candidates)
+                built = True
+            except RuntimeError:
+                if self.is_alive():  # timed out while running: a real failure
+                    raise
+        if not built:
+            if self._proc is not None:
+                self.restarts += 1
+                print(f"Tailwind daemon exited (code {self._proc.returncode}), restarting.")
+            self._start(candidates)
+        copy_output(self._built_css, self.output_css_path)
+        print(f"Built tailwind.css via daemon in {(time.perf_counter() - start) * 1000:.0f} ms "
+              f"({os.path.getsize(self.output_css_path) // 1024} KB).")
+        return True
+
+    def stop(self):
+        """Close stdin so the CLI leaves watch mode, escalating to terminate/kill if it lingers."""
+        proc, self._proc = self._proc, None
+        if proc is None or proc.poll() is not None:
+            return
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            proc.terminate()
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
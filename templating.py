@@ -0,0 +1,58 @@
+"""
+templating.py — Shared Jinja setup for the portfolio and music apps.
+
+Usage:
+    app = Flask(__name__)
+    configure_templates(app)                  -> bytecode cache in .cache/jinja/
+    compile_templates(app, ["music.html"])    -> compile up front instead of on first render
+
+Both apps load templates/ with the same options and one FileSystemBytecodeCache,
+so a template is lexed, parsed and compiled once per source change instead of
+once per process. Build-pool workers, the music app and restarted dev servers
+load the cached bytecode. compile_templates() is the ahead-of-time step: it
+compiles the templates (filling the bytecode cache and the environment's
+in-memory cache) so the first render doesn't pay for it. Edited templates are
+still picked up, since cache entries are checked against the source.
+"""
+
+import os
+import threading
+import time
+
+from jinja2 import FileSystemBytecodeCache
+
+
+BYTECODE_CACHE_DIR = os.path.join(".cache", "jinja")
+
+_BYTECODE_CACHES = {}
+_BYTECODE_LOCK = threading.Lock()
+
+
+def bytecode_cache(directory=BYTECODE_CACHE_DIR):
+    """The process-wide bytecode cache for `directory` (created on first use)."""
+    directory = os.path.abspath(directory)
+    with _BYTECODE_LOCK:
+        cache = _BYTECODE_CACHES.get(directory)
+        if cache is None:
+            os.makedirs(directory, exist_ok=True)
+            cache = _BYTECODE_CACHES[directory] = FileSystemBytecodeCache(directory)
+        return cache
+
+
+def configure_templates(app, cache_dir=BYTECODE_CACHE_DIR):
+    """Give `app`'s Jinja environment the shared bytecode cache. Must run before the first render."""
+    if "jinja_env" in app.__dict__:
+        raise RuntimeError(f"{app.name}: configure_templates() must run before the Jinja environment is created")
+    app.jinja_options = {**app.jinja_options, "bytecode_cache": bytecode_cache(cache_dir)}
+    return app
+
+
+def compile_templates(app, names=None):
+    """Load (and so compile) `names`, or every .html template `app` can see. Returns the count."""
+    start = time.perf_counter()
+    env = app.jinja_env
+    names = list(names) if names is not None else env.list_templates(extensions=["html"])
+    for name in names:
+        env.get_template(name)
+    print(f"Compiled {len(names)} templates in {(time.perf_counter() - start) * 1000:.0f} ms.")
+    return len(names)
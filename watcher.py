@@ -0,0 +1,76 @@
+"""
+watcher.py — Dependency-free polling file watcher with debouncing.
+
+Usage:
+    watcher = PollingWatcher(["website_data.json", "templates", "case_studies"], on_change)
+    watcher.start()          -> on_change(sorted_changed_paths) runs on a daemon thread
+    watcher.stop()
+
+Directories are walked recursively. A burst of edits (editor save + swap files,
+several files saved at once) is coalesced: the callback fires once the tree has
+been quiet for `debounce` seconds.
+"""
+
+import os
+import threading
+import time
+
+
+class PollingWatcher:
+    """Poll the mtime/size of watched files and report changes after a quiet period."""
+
+    def __init__(self, paths, callback, interval=0.1, debounce=0.15):
+        self.paths = list(paths)
+        self.callback = callback
+        self.interval = interval
+        self.debounce = debounce
+        self._stop = threading.Event()
+        self._thread = None
+
+    def snapshot(self):
+        """Return {path: (mtime_ns, size)} for every watched file."""
+        state = {}
+        for root in self.paths:
+            if os.path.isdir(root):
+                for dirpath, _, filenames in os.walk(root):
+                    for name in filenames:
+                        self._stat_into(state, os.path.join(dirpath, name))
+            else:
+                self._stat_into(state, root)
+        return state
+
+    @staticmethod
+    def _stat_into(state, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        state[path] = (st.st_mtime_ns, st.st_size)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="file-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        previous = self.snapshot()
+        pending = set()
+        last_change = 0.0
+        while not self._stop.wait(self.interval):
+            current = self.snapshot()
+            changed = {p for p in previous.keys() | current.keys() if previous.get(p) != current.get(p)}
+            previous = current
+            if changed:
+                pending |= changed
+                last_change = time.monotonic()
+            elif pending and time.monotonic() - last_change >= self.debounce:
+                batch, pending = sorted(pending), set()
+                try:
+                    self.callback(batch)
+                except Exception as e:
+                    print(f"Watch callback failed: {e}")
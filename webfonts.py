@@ -0,0 +1,163 @@
+"""
+webfonts.py — Self-hosted, subsetted copies of the site's Google Fonts.
+
+Usage:
+    faces = vendor_google_fonts(FAMILIES, ".cache/webfonts")
+    webfonts = build_webfonts(faces, "output/static/fonts", used_code_points(index_html, data_json))
+    webfonts["css"]          -> "fonts/fonts.css"    (default + code families)
+    webfonts["sandbox_css"]  -> "fonts/sandbox.css"  (picker-only families, loaded on demand)
+    webfonts["preload"]      -> ["fonts/inter-400.woff2", ...]
+
+The Google Fonts CSS API is queried once (without a browser User-Agent it answers
+with one full TrueType file per weight), the font files go through the checksummed
+asset cache, and each face is cut down to the characters the content uses and
+written as WOFF2 next to the two stylesheets.
+"""
+
+import hashlib
+import os
+import re
+from urllib.parse import quote_plus
+
+from assets import fetch_assets, make_session
+from font_subset import subset_font
+from output_writer import prune_outputs, write_output
+
+
+# (family, weights, role): "preload" faces are preloaded on every page, "core" faces are
+# declared up front but only fetched when used, "sandbox" faces load when the font picker opens
+FAMILIES = [
+    ("Inter", (400, 600, 700), "preload"),
+    ("Poppins", (600, 700), "preload"),
+    ("Space Mono", (400, 700), "core"),
+    ("Roboto", (400, 600, 700), "sandbox"),
+    ("Lato", (400, 700), "sandbox"),
+    ("Merriweather", (400, 700), "sandbox"),
+    ("Playfair Display", (400, 600, 700), "sandbox"),
+]
+
+_CSS_API = "https://fonts.googleapis.com/css2"
+_FONT_FACE_RE = re.compile(r"@font-face\s*\{([^}]*)\}")
+_DESCRIPTOR_RE = re.compile(r"([\w-]+)\s*:\s*([^;]+)")
+_URL_RE = re.compile(r"""url\(["']?([^)"']+)["']?\)""")
+
+# Printable ASCII plus common typography, so script-generated text and small edits still render
+_BASE_CODE_POINTS = set(range(0x20, 0x7F)) | {
+    0xA0, 0xA9, 0xAE, 0xB7, 0x2013, 0x2014, 0x2018, 0x2019, 0x201C, 0x201D, 0x2022, 0x2026, 0x2192,
+}
+
+
+def google_css_url(families=FAMILIES):
+    """The css2 API URL for `families`."""
+    params = "&".join(f"family={quote_plus(name)}:wght@{';'.join(str(w) for w in weights)}"
+                      for name, weights, _ in families)
+    return f"{_CSS_API}?{params}&display=swap"
+
+
+def parse_font_faces(css):
+    """Return [{family, weight, style, url}] for each @font-face in `css`."""
+    faces = []
+    for block in _FONT_FACE_RE.findall(css):
+        descriptors = {k.lower(): v.strip() for k, v in _DESCRIPTOR_RE.findall(block)}
+        url = _URL_RE.search(descriptors.get("src", ""))
+        if not url:
+            continue
+        faces.append({
+            "family": descriptors.get("font-family", "").strip("'\""),
+            "weight": int(descriptors.get("font-weight", "400").split()[0]),
+            "style": descriptors.get("font-style", "normal"),
+            "url": url.group(1),
+        })
+    return faces
+
+
+def _slug(face):
+    name = face["family"].lower().replace(" ", "-")
+    return f"{name}-{face['weight']}{'-italic' if face['style'] == 'italic' else ''}"
+
+
+def vendor_google_fonts(families, cache_dir, download=True):
+    """Return the faces of `families`, each with a local `path` to its source font file.
+    With download=False only files already in `cache_dir` are used. Raises RuntimeError
+    if any face is unavailable."""
+    os.makedirs(cache_dir, exist_ok=True)
+    url = google_css_url(families)
+    css_path = os.path.join(cache_dir, f"google-fonts-{hashlib.sha256(url.encode('utf-8')).hexdigest()[:12]}.css")
+    if not os.path.exists(css_path):
+        if not download:
+            raise RuntimeError("fonts have not been downloaded yet")
+        with make_session() as session:
+            resp = session.get(url, timeout=10)
+            resp.raise_for_status()
+        tmp_path = f"{css_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(resp.text)
+        os.replace(tmp_path, css_path)
+    with open(css_path, "r", encoding="utf-8") as f:
+        faces = parse_font_faces(f.read())
+    if not faces:
+        raise RuntimeError(f"no @font-face rules in {css_path}")
+
+    # The gstatic URLs come from Google's CSS response, not from this repo: not pinned
+    specs = []
+    for face in faces:
+        ext = os.path.splitext(face["url"].split("?")[0])[1] or ".ttf"
+        face["path"] = os.path.join(cache_dir, _slug(face) + ext)
+        specs.append({"name": f"{face['family']} {face['weight']}", "url": face["url"],
+                      "dest": face["path"], "timeout": 15, "pin": False})
+    if download:
+        results = fetch_assets(specs)
+    else:
+        results = {s["name"]: os.path.exists(s["dest"]) for s in specs}
+    missing = [name for name, ok in results.items() if not ok]
+    if missing:
+        raise RuntimeError(f"missing font files: {', '.join(missing)}")
+    return faces
+
+
+def used_code_points(*documents):
+    """Code points to keep: every character of the given strings plus printable ASCII."""
+    points = set(_BASE_CODE_POINTS)
+    for doc in documents:
+        points.update(map(ord, doc))
+    return points
+
+
+def _font_face_css(face, url):
+    return (f"@font-face{{font-family:'{face['family']}';font-style:{face['style']};"
+            f"font-weight:{face['weight']};font-display:swap;src:url({url}) format(\"woff2\")}}")
+
+
+def _role(face, families):
+    return {name: role for name, _, role in families}.get(face["family"], "sandbox")
+
+
+def webfont_paths(faces, out_dir, families=FAMILIES):
+    """The stylesheet and preload paths build_webfonts() writes, relative to `out_dir`'s parent."""
+    prefix = os.path.basename(out_dir)
+    return {
+        "css": f"{prefix}/fonts.css",
+        "sandbox_css": f"{prefix}/sandbox.css",
+        "preload": [f"{prefix}/{_slug(face)}.woff2" for face in faces if _role(face, families) == "preload"],
+    }
+
+
+def build_webfonts(faces, out_dir, code_points, families=FAMILIES):
+    """Subset every face in `faces` to `code_points` under `out_dir` and write fonts.css and
+    sandbox.css. Returns webfont_paths()."""
+    os.makedirs(out_dir, exist_ok=True)
+    css = {"core": [], "sandbox": []}
+    total = 0
+    written = {"fonts.css", "sandbox.css"}
+    for face in faces:
+        name = f"{_slug(face)}.woff2"
+        written.add(name)
+        total += subset_font(face["path"], os.path.join(out_dir, name), unicodes=code_points)
+        # Stylesheets live next to the fonts, so the URLs are bare file names
+        css["sandbox" if _role(face, families) == "sandbox" else "core"].append(_font_face_css(face, name))
+    for kind, filename in (("core", "fonts.css"), ("sandbox", "sandbox.css")):
+        write_output(os.path.join(out_dir, filename), "\n".join(css[kind]) + "\n")
+    # Faces that were dropped from FAMILIES go only after the new files are in place
+    prune_outputs(out_dir, written)
+    print(f"Web fonts: {len(faces)} faces subset to {len(code_points)} characters ({total // 1024} KB WOFF2).")
+    return webfont_paths(faces, out_dir, families)